@@ -8,22 +8,45 @@ __version__ = "1.5.1"
 __author__ = 'userprojekt'
 
 
-import DaVinciResolveScript as dvr_script
-resolve = dvr_script.scriptapp("Resolve")
 import os
+import re
 import sys
 import argparse
 import json
+import time
+import hashlib
+import shutil
+import struct
+import subprocess
+import threading
+import queue
+import zlib
+import select
+import ctypes
+import ctypes.util
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
-def counter():
-    i = 0
+# Connected on first use, so process pool workers (which re-import this script) never touch Resolve
+resolve = None
+
+def get_resolve():
+    """Return the scripting object of the running DaVinci Resolve, connecting on first use"""
+    global resolve
+    if resolve is None:
+        import DaVinciResolveScript as dvr_script
+        resolve = dvr_script.scriptapp("Resolve")
+        if resolve is None:
+            print("Error: Could not connect to DaVinci Resolve. Make sure it is running.")
+            sys.exit(1)
+    return resolve
+
+def counter(start=0):
+    i = start
     while True:
         i += 1
         yield i
 
-c = counter()
-
 def clean_path_input(path):
     # Handle shell escape sequences (from terminal drag-drop or manual input)
     path = path.replace("\\ ", " ")
@@ -198,36 +221,607 @@ def parse_selection(choice, max_num):
     
     return sorted(set(indices))  # Remove duplicates and sort
 
-def process_files_in_resolve(organized_files, selected_footage_folders, proxy_folder_path, subfolder_depth, is_directory_mode=False, clean_image=False, codec='auto'):
-    """Process files in DaVinci Resolve"""
-    # Create project with appropriate name based on mode
-    ProjectManager = resolve.GetProjectManager()
+# Cine formats written one file per frame, collapsed into a single sequence entry before import
+IMAGE_SEQUENCE_EXTENSIONS = {'.dpx', '.exr', '.cin', '.ari', '.arx'}
+# Formats also used for stills, only collapsed when the run of frames is long enough
+LONG_SEQUENCE_EXTENSIONS = {'.tif', '.tiff', '.dng'}
+MIN_LONG_SEQUENCE_FRAMES = 24
+# Metadata, thumbnail and proxy files written next to the clips, per camera vendor
+SIDECAR_EXTENSIONS = {
+    'Sony': {'.xml', '.bim', '.smi', '.ppn', '.xmp'},
+    'Canon': {'.cif', '.cpf', '.rmf'},
+    'RED': {'.rtn', '.rmd'},
+    'ARRI': {'.ale', '.arimeta'},
+    'Blackmagic': {'.sidecar'},
+    'GoPro': {'.thm', '.lrv'},
+    'DJI': {'.srt', '.lrf'},
+    'Panasonic': {'.bmp'},
+    'AVCHD': {'.cpi', '.mpl', '.bdm', '.tdt', '.tid'},
+    'Offload': {'.md5', '.mhl', '.txt', '.log', '.pdf', '.csv'},
+}
+SIDECAR_EXTENSION_SET = set().union(*SIDECAR_EXTENSIONS.values())
+# Card subfolders that only hold thumbnails, low-res proxies or metadata. Skipped only inside
+# a card structure (see CARD_STRUCTURE_DIRECTORIES) or when they hold nothing but sidecar files,
+# so a user folder that happens to be called Backup or Sub is still imported
+SIDECAR_DIRECTORIES = {'THMBNL', 'SUB', 'GENERAL', 'ICON', 'PROXY', 'VOICE', 'CLIPINF', 'PLAYLIST', 'BACKUP'}
+THUMBNAIL_EXTENSIONS = {'.jpg', '.jpeg', '.bmp', '.png', '.thm'}
+# Roots of structured cards (P2, AVCHD/XAVC S, XDCAM EX, XDCAM), whose folder is passed to
+# Resolve unchanged so it can link each clip with its separate audio and metadata files
+CARD_ROOT_DIRECTORIES = {'CONTENTS', 'PRIVATE', 'BPAV', 'XDROOT'}
+# Folders of a card structure whose sidecar subfolders are always skipped
+CARD_STRUCTURE_DIRECTORIES = CARD_ROOT_DIRECTORIES | {'M4ROOT', 'CLPR', 'BDMV', 'AVCHD'}
 
-    # Generate timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+FRAME_NUMBER_PATTERN = re.compile(r'^(.*?)(\d+)(\.[^.]+)$')
+R3D_SPAN_PATTERN = re.compile(r'_(\d{3})\.r3d$', re.IGNORECASE)
 
-    # Create project name with timestamp
-    base_name = "proxy" if is_directory_mode else "proxy_redo"
-    project_name = f"{base_name}_{timestamp}"
+def collapse_frame_sequences(frame_files):
+    """Collapse numbered frames into Resolve ImportMedia sequence entries.
 
-    Project = ProjectManager.CreateProject(project_name)
-    MediaStorage = resolve.GetMediaStorage()
-    MediaPool = Project.GetMediaPool()
-    RootFolder = MediaPool.GetRootFolder()
+    Frames are grouped by folder, name prefix and extension, and split into runs of
+    consecutive frame numbers. Zero-padded numbers are grouped by their width, unpadded
+    numbers (f_998 ... f_1001) form a single group. Single frames, and TIFF/DNG runs
+    shorter than MIN_LONG_SEQUENCE_FRAMES, are stills and dropped.
+    """
+    groups = {}
+    for path in frame_files:
+        folder, name = os.path.split(path)
+        match = FRAME_NUMBER_PATTERN.match(name)
+        if not match:
+            continue
+        prefix, digits, ext = match.groups()
+        groups.setdefault((folder, prefix, ext), []).append(digits)
+
+    sequences = []
+    for (folder, prefix, ext), frame_numbers in sorted(groups.items()):
+        # Padded frame numbers keep the width of the padding, unpadded ones grow wider
+        padded_widths = {len(digits) for digits in frame_numbers if len(digits) > 1 and digits.startswith('0')}
+        numbers_by_padding = {}
+        for digits in frame_numbers:
+            padding = len(digits) if len(digits) in padded_widths else 0
+            numbers_by_padding.setdefault(padding, []).append(int(digits))
+
+        min_frames = MIN_LONG_SEQUENCE_FRAMES if ext.lower() in LONG_SEQUENCE_EXTENSIONS else 2
+        for padding, numbers in sorted(numbers_by_padding.items()):
+            numbers.sort()
+            number_format = f"%0{padding}d" if padding else "%d"
+            pattern = os.path.join(folder, f"{prefix.replace('%', '%%')}{number_format}{ext}")
+            run_start = previous = numbers[0]
+            for number in numbers[1:] + [None]:
+                if number is not None and number == previous + 1:
+                    previous = number
+                    continue
+                if previous - run_start + 1 >= min_frames:
+                    sequences.append({"FilePath": pattern, "StartIndex": run_start, "EndIndex": previous})
+                if number is not None:
+                    run_start = previous = number
+    return sequences
+
+def is_sidecar_directory(parent, path):
+    """True if path is a thumbnail/proxy/metadata folder of a card rather than a folder of clips"""
+    name = os.path.basename(path)
+    if name.upper() not in SIDECAR_DIRECTORIES:
+        return False
+    if os.path.basename(parent.rstrip(os.sep)).upper() in CARD_STRUCTURE_DIRECTORIES:
+        return True
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name.startswith('.'):
+                    continue
+                ext = os.path.splitext(entry.name)[1].lower()
+                if not entry.is_file() or ext not in SIDECAR_EXTENSION_SET | THUMBNAIL_EXTENSIONS:
+                    return False
+    except OSError:
+        return False
+    return True
+
+def scan_media_items(items, verbose=True):
+    """Expand files and folders into (clip files, frame sequences) ready for import.
+
+    Sidecar files and folders are skipped (skipped folders are printed when verbose),
+    numbered image files are collapsed into sequences, and only the first segment of
+    spanned R3D clips is kept. Files with unknown extensions are passed through so
+    Resolve can decide. Folders holding a structured card (see CARD_ROOT_DIRECTORIES)
+    are passed through unchanged.
+    """
+    clip_files = []
+    frame_files = []
+
+    def add_file(path, name):
+        if name.startswith('.'):
+            return
+        ext = os.path.splitext(name)[1].lower()
+        if ext in SIDECAR_EXTENSION_SET:
+            return
+        if ext in IMAGE_SEQUENCE_EXTENSIONS or ext in LONG_SEQUENCE_EXTENSIONS:
+            frame_files.append(path)
+            return
+        span = R3D_SPAN_PATTERN.search(name)
+        if span and span.group(1) != '001':
+            return
+        clip_files.append(path)
+
+    for item in items:
+        if not os.path.isdir(item):
+            add_file(item, os.path.basename(item))
+            continue
+        if os.path.basename(item.rstrip(os.sep)).upper() in CARD_ROOT_DIRECTORIES:
+            clip_files.append(item)
+            continue
+        stack = [item]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            if any(entry.name.upper() in CARD_ROOT_DIRECTORIES and entry.is_dir() for entry in entries):
+                clip_files.append(current)
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name.startswith('.'):
+                        continue
+                    if is_sidecar_directory(current, entry.path):
+                        if verbose:
+                            print(f"  Skipping sidecar folder: {entry.path}")
+                        continue
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    add_file(entry.path, entry.name)
+
+    return sorted(clip_files), collapse_frame_sequences(frame_files)
+
+FINGERPRINT_SAMPLE_SIZE = 1024 * 1024
+# Image files are never fingerprinted: identical frames (e.g. black DPX frames) are not duplicate clips
+FINGERPRINT_SKIP_EXTENSIONS = IMAGE_SEQUENCE_EXTENSIONS | LONG_SEQUENCE_EXTENSIONS | {'.jpg', '.jpeg', '.png', '.heic'}
+
+def fingerprint_file(path, sample_size=FINGERPRINT_SAMPLE_SIZE):
+    """Cheap clip fingerprint: file size plus a hash of the first, middle and last sample"""
+    size = os.path.getsize(path)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(size).encode())
+    with open(path, 'rb') as f:
+        if size <= sample_size * 3:
+            digest.update(f.read())
+        else:
+            for offset in (0, (size - sample_size) // 2, size - sample_size):
+                f.seek(offset)
+                digest.update(f.read(sample_size))
+    return f"{size}:{digest.hexdigest()}"
+
+def fingerprint_files(paths, workers=8):
+    """Fingerprint files in parallel, returns {path: fingerprint} (unreadable files are left out)"""
+    def safe_fingerprint(path):
+        try:
+            return fingerprint_file(path)
+        except OSError:
+            return None
+
+    fingerprints = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for path, fingerprint in zip(paths, executor.map(safe_fingerprint, paths)):
+            if fingerprint:
+                fingerprints[path] = fingerprint
+    return fingerprints
+
+def list_clip_files(path, min_size=FINGERPRINT_SAMPLE_SIZE):
+    """Return (files under path, or path itself, that are large enough to be clips, whether images were found)"""
+    if os.path.isfile(path):
+        candidates = [path]
+    else:
+        candidates = []
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            candidates.extend(os.path.join(root, name) for name in files if not name.startswith('.'))
+
+    clip_files = []
+    has_images = False
+    for candidate in candidates:
+        if os.path.splitext(candidate)[1].lower() in FINGERPRINT_SKIP_EXTENSIONS:
+            has_images = True
+            continue
+        try:
+            if os.path.getsize(candidate) >= min_size:
+                clip_files.append(candidate)
+        except OSError:
+            continue
+    return sorted(clip_files), has_images
+
+class FingerprintStore:
+    """Persistent map of clip fingerprints to the source path and proxy folder they were rendered to.
+
+    A clip is recorded once its render job has been added, and marked rendered when the
+    job completes. Records of jobs that failed or were cancelled are dropped again.
+    With --dedup link, duplicates found before the proxy exists are kept in the record's
+    'links' list and linked once the proxy has been rendered.
+    """
+
+    def __init__(self, store_path):
+        self.store_path = store_path
+        self.records = {}
+        self.jobs = {}  # render job id -> fingerprints queued with it in this session
+        try:
+            with open(store_path, 'r', encoding='utf-8') as f:
+                self.records = json.load(f)
+        except (OSError, ValueError):
+            self.records = {}
+
+    def is_queued(self, fingerprint):
+        return any(fingerprint in fingerprints for fingerprints in self.jobs.values())
+
+    def find_duplicate(self, fingerprint, source_path):
+        """Return the record of an earlier copy at another path, or None.
+
+        A record whose render was not seen to complete only counts while its job is
+        queued in this session, or once its proxy exists in the proxy folder.
+        """
+        record = self.records.get(fingerprint)
+        if not record or record['source'] == source_path:
+            return None
+        if record.get('rendered', True) or self.is_queued(fingerprint):
+            return record
+        if find_rendered_proxy(record['source'], record['proxy_dir']):
+            record['rendered'] = True
+            return record
+        return None
+
+    def add_link(self, fingerprint, source_path, target_dir):
+        """Remember to link the proxy of fingerprint into target_dir once it has been rendered"""
+        links = self.records[fingerprint].setdefault('links', [])
+        if [source_path, target_dir] not in links:
+            links.append([source_path, target_dir])
+
+    def link_pending(self):
+        """Create the pending links whose proxy now exists, returns True if any were created"""
+        changed = False
+        for record in self.records.values():
+            if not record.get('links') or not find_rendered_proxy(record['source'], record['proxy_dir']):
+                continue
+            # Links that fail now (e.g. unsupported by the file system) are reported once, not retried
+            for link_source, target_dir in record.pop('links'):
+                link_existing_proxy(link_source, record, target_dir)
+            changed = True
+        return changed
+
+    def add(self, fingerprint, source_path, proxy_dir, job_id):
+        """Record a clip whose render job job_id has been added"""
+        record = self.records.get(fingerprint)
+        if record and record.get('rendered', True) and record['source'] != source_path:
+            return
+        self.records[fingerprint] = {'source': source_path, 'proxy_dir': proxy_dir, 'rendered': False}
+        if record and record.get('links'):
+            self.records[fingerprint]['links'] = record['links']
+        self.jobs.setdefault(job_id, []).append(fingerprint)
+
+    def update_from_jobs(self, Project):
+        """Mark clips of completed jobs as rendered and drop those of failed jobs, returns True if changed"""
+        changed = False
+        for job_id, fingerprints in list(self.jobs.items()):
+            status = (Project.GetRenderJobStatus(job_id) or {}).get('JobStatus')
+            if status not in ('Complete', 'Failed', 'Cancelled'):
+                continue
+            for fingerprint in fingerprints:
+                record = self.records.get(fingerprint)
+                if record is None or record.get('rendered', True):
+                    continue
+                if status == 'Complete':
+                    record['rendered'] = True
+                else:
+                    for link_source, _ in record.get('links', []):
+                        print(f"Not linking {link_source}: the render of {record['source']} did not complete")
+                    del self.records[fingerprint]
+            del self.jobs[job_id]
+            changed = True
+        if changed:
+            self.link_pending()
+        return changed
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.store_path), exist_ok=True)
+        tmp_path = self.store_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.records, f, indent=1)
+        os.replace(tmp_path, self.store_path)
+
+def open_fingerprint_store(proxy_path, dedup_mode):
+    """Return the FingerprintStore kept in the proxy folder, or None when dedup is off"""
+    if dedup_mode in (None, 'off'):
+        return None
+    fingerprint_store = FingerprintStore(os.path.join(proxy_path, ".proxy_fingerprints.json"))
+    # Links left pending by an earlier run whose renders have finished since
+    if fingerprint_store.link_pending():
+        fingerprint_store.save()
+    return fingerprint_store
+
+def find_rendered_proxy(source_path, proxy_dir):
+    """Return the path of the proxy rendered for source_path in proxy_dir, or None"""
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    try:
+        names = os.listdir(proxy_dir)
+    except OSError:
+        return None
+    for name in names:
+        if os.path.splitext(name)[0] == stem and not name.startswith('.'):
+            return os.path.join(proxy_dir, name)
+    return None
+
+def link_existing_proxy(source_path, record, target_dir):
+    """Symlink the proxy rendered for an earlier copy of source_path into target_dir.
+
+    Returns False if the proxy has not been rendered yet or the link could not be made.
+    """
+    proxy_path = find_rendered_proxy(record['source'], record['proxy_dir'])
+    if not proxy_path:
+        return False
+
+    link_path = os.path.join(target_dir, os.path.basename(proxy_path))
+    if os.path.lexists(link_path):
+        return True
+    try:
+        os.makedirs(target_dir, exist_ok=True)
+        os.symlink(proxy_path, link_path)
+        return True
+    except OSError as e:
+        print(f"    Could not link proxy for {source_path}: {e}")
+        return False
+
+def deduplicate_items(items, fingerprint_store, target_dir, dedup_mode='skip'):
+    """Drop clips that were already rendered (or queued) from another path before they are imported.
+
+    Folders without duplicates are kept whole, folders that are entirely duplicates are
+    dropped, and partially duplicated folders are replaced by their remaining files
+    (folders that also hold image files are kept whole, so their frames are not lost).
+    Returns (kept items, {path: fingerprint} of the kept clips); the fingerprints are
+    recorded in the store once the clips' render job has been added. With dedup_mode
+    'link', duplicates of clips that are not rendered yet are linked once they are.
+    """
+    clip_files_by_item = {item: list_clip_files(item) for item in items}
+    all_files = [path for files, _ in clip_files_by_item.values() for path in files]
+    fingerprints = fingerprint_files(all_files)
 
+    kept_items = []
+    kept_fingerprints = {}
+    seen_in_batch = {}
+    duplicate_count = 0
+    for item, (clip_files, has_images) in clip_files_by_item.items():
+        unique_files = []
+        for path in clip_files:
+            fingerprint = fingerprints.get(path)
+            record = fingerprint_store.find_duplicate(fingerprint, path) if fingerprint else None
+            in_store = record is not None
+            if record is None and fingerprint in seen_in_batch:
+                # Same proxy folder as the copy that is kept, so there is nothing to link
+                record = {'source': seen_in_batch[fingerprint], 'proxy_dir': target_dir}
+            if record:
+                duplicate_count += 1
+                print(f"    Duplicate of {record['source']}: {path}")
+                if dedup_mode == 'link' and in_store and not link_existing_proxy(path, record, target_dir):
+                    print(f"    Proxy will be linked once {os.path.basename(record['source'])} has rendered")
+                    fingerprint_store.add_link(fingerprint, path, target_dir)
+            else:
+                unique_files.append(path)
+                if fingerprint:
+                    seen_in_batch[fingerprint] = path
+                    kept_fingerprints[os.path.normpath(path)] = fingerprint
+
+        if len(unique_files) == len(clip_files):
+            kept_items.append(item)
+        elif has_images:
+            print(f"    Keeping {item} whole because it contains image files")
+            kept_items.append(item)
+        else:
+            kept_items.extend(unique_files)
+
+    if duplicate_count:
+        print(f"    Skipped {duplicate_count} duplicate clip(s)")
+    return kept_items, kept_fingerprints
+
+def select_render_presets(codec):
+    """Return (standard_preset, multi_audio_preset) for the requested codec"""
     codec = codec.lower()
     if codec in ('h265', 'hevc', '265'):
-        standard_preset = multi_audio_preset = 'FHD_h.265_420_8bit_5Mbps'
+        return 'FHD_h.265_420_8bit_5Mbps', 'FHD_h.265_420_8bit_5Mbps'
     elif codec == 'prores':
-        standard_preset = multi_audio_preset = 'FHD_prores_proxy'
-    else:  # auto
-        standard_preset = 'FHD_h.265_420_8bit_5Mbps'
-        multi_audio_preset = 'FHD_prores_proxy'
-    
+        return 'FHD_prores_proxy', 'FHD_prores_proxy'
+    # auto
+    return 'FHD_h.265_420_8bit_5Mbps', 'FHD_prores_proxy'
+
+def get_or_create_subfolder(MediaPool, parent_folder, name):
+    """Return the Media Pool subfolder called name, creating it if needed"""
+    for folder in parent_folder.GetSubFolderList():
+        if folder.GetName() == name:
+            return folder
+    return MediaPool.AddSubFolder(parent_folder, name)
+
+def open_project(ProjectManager, project_name):
+    """Load an existing project by name, or create it if it does not exist yet"""
+    Project = ProjectManager.LoadProject(project_name)
+    if Project:
+        print(f"Loaded existing project: {project_name}")
+    else:
+        Project = ProjectManager.CreateProject(project_name)
+        print(f"Created project: {project_name}")
+    return Project
+
+# Proxy size model used for free-space admission control
+H265_PROXY_BITRATE = 5000000  # FHD_h.265_420_8bit_5Mbps
+# ProRes 422 Proxy at 1920x1080 (Apple ProRes white paper), scaled by proxy width
+PRORES_PROXY_BITRATES = {
+    23.976: 36000000, 24: 36000000, 25: 38000000, 29.97: 45000000, 30: 45000000,
+    50: 76000000, 59.94: 91000000, 60: 91000000,
+}
+PCM_BITRATE_PER_CHANNEL = 48000 * 32  # presets render 32-bit linear PCM
+COMPRESSED_AUDIO_BITRATE = 128000
+CONTAINER_OVERHEAD = 1.02
+
+def clip_duration(clip):
+    """Return (seconds, fps) for a Media Pool clip, or (0, 0) if unknown"""
+    try:
+        frames = float(clip.GetClipProperty("Frames"))
+        fps = float(clip.GetClipProperty("FPS"))
+    except (TypeError, ValueError):
+        return 0.0, 0.0
+    if fps <= 0:
+        return 0.0, 0.0
+    return frames / fps, fps
+
+def estimate_proxy_bytes(duration, fps, audio_channels, render_preset, proxy_width):
+    """Estimate the size of a proxy rendered with render_preset at proxy_width x 1080"""
+    if 'prores' in render_preset.lower():
+        nearest_fps = min(PRORES_PROXY_BITRATES, key=lambda rate: abs(rate - fps)) if fps else 25
+        video_bitrate = PRORES_PROXY_BITRATES[nearest_fps] * (fps or nearest_fps) / nearest_fps
+        video_bitrate *= int(proxy_width) / 1920
+        audio_bitrate = PCM_BITRATE_PER_CHANNEL * audio_channels
+    else:
+        video_bitrate = H265_PROXY_BITRATE
+        audio_bitrate = COMPRESSED_AUDIO_BITRATE if audio_channels else 0
+    return int((video_bitrate + audio_bitrate) / 8 * duration * CONTAINER_OVERHEAD)
+
+def estimate_job_bytes(clips, render_preset, proxy_width):
+    """Estimate the output bytes of a render job made from clips"""
+    total = 0
+    for clip in clips:
+        duration, fps = clip_duration(clip)
+        try:
+            audio_channels = int(clip.GetClipProperty("Audio Ch") or 0)
+        except (TypeError, ValueError):
+            audio_channels = 0
+        total += estimate_proxy_bytes(duration, fps, audio_channels, render_preset, proxy_width)
+    return total
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1000:
+            return f"{size:.1f} {unit}"
+        size /= 1000
+    return f"{size:.2f} TB"
+
+class StorageBudget:
+    """Admit render jobs only while their estimated size fits the free space of each target volume.
+
+    Free space is read again for every admission. The estimates of admitted jobs count
+    against it until release_finished sees the jobs finish, as their output is on disk then.
+    """
+
+    def __init__(self, reserve_bytes=0):
+        self.reserve_bytes = reserve_bytes
+        self.started_at = time.time()
+        self.volume_paths = {}
+        self.estimated_bytes = {}
+        self.reservations = []
+        self.estimates_by_dir = {}
+        self.held_back = []
+
+    def volume_of(self, target_dir):
+        """Return (device id, existing path) of the volume target_dir will be written to"""
+        path = os.path.abspath(target_dir)
+        while not os.path.exists(path):
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+        return os.stat(path).st_dev, path
+
+    def admit(self, target_dir, estimated_bytes, description="", source_items=None):
+        """Reserve space for the render jobs of a folder.
+
+        Returns the reservation, whose 'job_ids' list the caller fills with the jobs it
+        adds, or None (and records the folder as held back) if it does not fit.
+        """
+        reservation = {'volume': None, 'bytes': estimated_bytes, 'job_ids': []}
+        try:
+            volume, existing_path = self.volume_of(target_dir)
+            free_bytes = shutil.disk_usage(existing_path).free
+        except OSError:
+            return reservation
+        self.volume_paths.setdefault(volume, existing_path)
+
+        outstanding = sum(r['bytes'] for r in self.reservations if r['volume'] == volume)
+        if estimated_bytes > free_bytes - self.reserve_bytes - outstanding:
+            self.held_back.append((description, target_dir, estimated_bytes, list(source_items or [])))
+            return None
+
+        reservation['volume'] = volume
+        self.reservations.append(reservation)
+        self.estimated_bytes[volume] = self.estimated_bytes.get(volume, 0) + estimated_bytes
+        self.estimates_by_dir[target_dir] = self.estimates_by_dir.get(target_dir, 0) + estimated_bytes
+        return reservation
+
+    def release_finished(self, Project):
+        """Stop counting the estimates of jobs that have finished rendering"""
+        for reservation in list(self.reservations):
+            statuses = [(Project.GetRenderJobStatus(job_id) or {}).get('JobStatus')
+                        for job_id in reservation['job_ids']]
+            if all(status in ('Complete', 'Failed', 'Cancelled') for status in statuses):
+                self.reservations.remove(reservation)
+
+    def print_summary(self):
+        print("\n=== Proxy Storage Estimate ===")
+        for volume, path in self.volume_paths.items():
+            try:
+                free = format_bytes(shutil.disk_usage(path).free)
+            except OSError:
+                free = "unknown"
+            print(f"{path}: {format_bytes(self.estimated_bytes.get(volume, 0))} estimated, {free} free")
+        if self.held_back:
+            print(f"\nHeld back {len(self.held_back)} folder(s) that would not fit:")
+            for description, target_dir, estimated_bytes, _ in self.held_back:
+                print(f"  {description} -> {target_dir} ({format_bytes(estimated_bytes)})")
+            print("Free up space and run again for these folders.")
+
+    def print_calibration(self):
+        """Compare estimated with actual proxy bytes once rendering has finished"""
+        print("\n=== Estimated vs Actual Proxy Size ===")
+        total_estimated = 0
+        total_actual = 0
+        for target_dir, estimated in sorted(self.estimates_by_dir.items()):
+            actual = 0
+            try:
+                entries = list(os.scandir(target_dir))
+            except OSError:
+                entries = []
+            for entry in entries:
+                if entry.is_file() and entry.stat().st_mtime >= self.started_at:
+                    actual += entry.stat().st_size
+            total_estimated += estimated
+            total_actual += actual
+            ratio = f"{actual / estimated:.2f}x" if estimated else "-"
+            print(f"{target_dir}: estimated {format_bytes(estimated)}, actual {format_bytes(actual)} ({ratio})")
+        if total_estimated:
+            print(f"Total: estimated {format_bytes(total_estimated)}, actual {format_bytes(total_actual)} "
+                  f"({total_actual / total_estimated:.2f}x)")
+
+def queue_files_in_project(Project, organized_files, selected_footage_folders, proxy_folder_path,
+                           clean_image=False, codec='auto', fingerprint_store=None, dedup_mode='skip',
+                           storage_budget=None, scan_items=True, resolve_app=None, scan_cache=None):
+    """Import footage into Project, build timelines and add render jobs.
+
+    Only clips imported by this call are put on timelines, so the function can be
+    called repeatedly on a persistent project. When a fingerprint_store is given,
+    clips already queued from another path are skipped (or linked) before import.
+    When a storage_budget is given, jobs whose estimated size does not fit the
+    target volume are held back. With scan_items, folders are expanded by
+    scan_media_items instead of being passed to Resolve as-is; scan_cache holds results
+    already scanned by partition_organized_files. resolve_app defaults to the running
+    DaVinci Resolve.
+    Returns the list of render job ids added.
+    """
+    MediaStorage = (resolve_app or get_resolve()).GetMediaStorage()
+    MediaPool = Project.GetMediaPool()
+    RootFolder = MediaPool.GetRootFolder()
+
+    standard_preset, multi_audio_preset = select_render_presets(codec)
+
     # Only load burn-in preset if not in clean mode
     if not clean_image:
         Project.LoadBurnInPreset("burn-in")
 
+    # Continue numbering after existing timelines so names stay unique in reused projects
+    timeline_counter = counter(Project.GetTimelineCount() or 0)
+    job_ids = []
+
     # Helper function to calculate proxy dimensions
     def calculate_proxy_dimensions(resolution_str):
         width, height = resolution_str.split("x")
@@ -241,12 +835,17 @@ def process_files_in_resolve(organized_files, selected_footage_folders, proxy_fo
         return str(int_proxy_width), proxy_height
 
     # Helper function to setup timeline and render job
-    def setup_timeline_and_render(clips, timeline_name, resolution_str, render_preset, target_dir):
+    def setup_timeline_and_render(clips, timeline_name, resolution_str, render_preset, target_dir,
+                                  clip_fingerprints=None):
         if not clips:
             return
         
-        timeline = MediaPool.CreateTimelineFromClips(timeline_name, clips)
         proxy_width, proxy_height = calculate_proxy_dimensions(resolution_str)
+
+        timeline = MediaPool.CreateTimelineFromClips(timeline_name, clips)
+        if not timeline:
+            print(f"    Failed to create timeline: {timeline_name}")
+            return
         
         # Set timeline settings
         timeline.SetSetting("useCustomSettings", "1")
@@ -265,9 +864,17 @@ def process_files_in_resolve(organized_files, selected_footage_folders, proxy_fo
         })
         
         # Add render job
-        Project.AddRenderJob()
+        job_id = Project.AddRenderJob()
+        if job_id:
+            job_ids.append(job_id)
+            # Clips only count for duplicate detection once their render job exists
+            if fingerprint_store is not None and clip_fingerprints:
+                for clip in clips:
+                    clip_path = os.path.normpath(clip.GetClipProperty("File Path") or "")
+                    if clip_path in clip_fingerprints:
+                        fingerprint_store.add(clip_fingerprints[clip_path], clip_path, target_dir, job_id)
         
-        return timeline
+        return job_id
 
     # Process each selected footage folder
     for footage_folder_path in selected_footage_folders:
@@ -277,7 +884,7 @@ def process_files_in_resolve(organized_files, selected_footage_folders, proxy_fo
         print(f"\nProcessing footage folder: {footage_folder_name}")
         
         # Create main folder in Media Pool
-        main_folder = MediaPool.AddSubFolder(RootFolder, footage_folder_name)
+        main_folder = get_or_create_subfolder(MediaPool, RootFolder, footage_folder_name)
         
         # Process each subfolder group
         for subfolder_path, items in sorted(subfolders_dict.items()):
@@ -290,20 +897,16 @@ def process_files_in_resolve(organized_files, selected_footage_folders, proxy_fo
                 # Create nested folder structure in Media Pool
                 current_folder = main_folder
                 for part in subfolder_parts:
-                    # Check if subfolder exists
-                    existing_folders = current_folder.GetSubFolderList()
-                    existing_names = [f.GetName() for f in existing_folders]
-                    
-                    if part not in existing_names:
-                        current_folder = MediaPool.AddSubFolder(current_folder, part)
-                    else:
-                        current_folder = next(f for f in existing_folders if f.GetName() == part)
+                    current_folder = get_or_create_subfolder(MediaPool, current_folder, part)
                 
                 working_folder = current_folder
             else:
                 print(f"  Processing items directly in footage folder ({len(items)} items)")
                 working_folder = main_folder
                 subfolder_parts = []
+
+            # Build target directory
+            target_dir = os.path.join(proxy_folder_path, footage_folder_name, *subfolder_parts)
             
             # Import items (could be files or folders)
             try:
@@ -313,28 +916,50 @@ def process_files_in_resolve(organized_files, selected_footage_folders, proxy_fo
                 if not items_to_import:
                     print(f"    No existing items found")
                     continue
+
+                # Expand folders into clips and frame sequences, leaving out sidecar files
+                sequences = []
+                if scan_items:
+                    scanned = (scan_cache or {}).get(tuple(items))
+                    items_to_import, sequences = scanned or scan_media_items(items_to_import)
+                    if sequences:
+                        print(f"    Found {len(items_to_import)} clips and {len(sequences)} image sequences")
+                    if not items_to_import and not sequences:
+                        print(f"    No media found")
+                        continue
+
+                # Drop footage that was already rendered or queued from another path
+                clip_fingerprints = {}
+                if fingerprint_store is not None and items_to_import:
+                    items_to_import, clip_fingerprints = deduplicate_items(items_to_import, fingerprint_store,
+                                                                           target_dir, dedup_mode)
+                    if not items_to_import and not sequences:
+                        print(f"    All items are duplicates of footage already queued")
+                        continue
                 
                 # Import items (files or folders - DaVinci will handle appropriately)
-                uncat_clips = MediaStorage.AddItemListToMediaPool(items_to_import)
+                uncat_clips = []
+                if items_to_import:
+                    uncat_clips.extend(MediaStorage.AddItemListToMediaPool(items_to_import) or [])
+                if sequences:
+                    uncat_clips.extend(MediaPool.ImportMedia(sequences) or [])
                 
                 if not uncat_clips:
                     print(f"    Failed to import items")
                     continue
                 
+                # Clips imported by this call, grouped by resolution and audio configuration
+                clip_groups = {}
+
                 # Create resolution-based subfolders and organize by audio tracks
                 for uncat_clip in uncat_clips:
                     resolution = uncat_clip.GetClipProperty("Resolution")
                     clip_type = uncat_clip.GetClipProperty("Type")
                     
-                    if clip_type != "Still":
+                    # Stills and audio-only clips (e.g. P2 audio MXFs) have no picture to proxy
+                    if clip_type != "Still" and "x" in (resolution or ""):
                         # Get or create resolution folder
-                        resolution_folder_list = working_folder.GetSubFolderList()
-                        resolution_folder_names = [f.GetName() for f in resolution_folder_list]
-                        
-                        if resolution not in resolution_folder_names:
-                            resolution_folder = MediaPool.AddSubFolder(working_folder, resolution)
-                        else:
-                            resolution_folder = next(f for f in resolution_folder_list if f.GetName() == resolution)
+                        resolution_folder = get_or_create_subfolder(MediaPool, working_folder, resolution)
                         
                         # Check audio track count
                         audio_track_count = uncat_clip.GetClipProperty("Audio Ch")
@@ -344,90 +969,151 @@ def process_files_in_resolve(organized_files, selected_footage_folders, proxy_fo
                             audio_tracks = 0
                         
                         # If more than 4 audio tracks, create/use a subfolder
-                        if audio_tracks > 4:
-                            multi_audio_folder_name = "MultiAudio_5+"
-                            resolution_subfolders = resolution_folder.GetSubFolderList()
-                            resolution_subfolder_names = [f.GetName() for f in resolution_subfolders]
-                            
-                            if multi_audio_folder_name not in resolution_subfolder_names:
-                                target_folder = MediaPool.AddSubFolder(resolution_folder, multi_audio_folder_name)
-                            else:
-                                target_folder = next(f for f in resolution_subfolders if f.GetName() == multi_audio_folder_name)
+                        is_multi_audio = audio_tracks > 4
+                        if is_multi_audio:
+                            target_folder = get_or_create_subfolder(MediaPool, resolution_folder, "MultiAudio_5+")
                         else:
                             target_folder = resolution_folder
                         
                         # Move clip to appropriate folder
                         MediaPool.MoveClips([uncat_clip], target_folder)
                         MediaPool.SetCurrentFolder(working_folder)
+
+                        groups = clip_groups.setdefault(resolution, {False: [], True: []})
+                        groups[is_multi_audio].append(uncat_clip)
                 
-                # Create timelines for each resolution and audio configuration
-                resolution_folder_list = working_folder.GetSubFolderList()
-                for resolution_folder in resolution_folder_list:
-                    resolution_folder_name = resolution_folder.GetName()
-                    footage_folder_name = os.path.basename(footage_folder_path)
-                    
-                    # Process clips directly in resolution folder (≤4 audio tracks)
-                    standard_clips = resolution_folder.GetClipList()
-                    if standard_clips:
-                        timeline_name = f"Video Resolution {resolution_folder_name}   #{next(c)}"
-                        
-                        # Build target directory
-                        if subfolder_parts:
-                            target_dir = os.path.join(proxy_folder_path, footage_folder_name, *subfolder_parts)
-                        else:
-                            target_dir = os.path.join(proxy_folder_path, footage_folder_name)
-                        
-                        print(f"    Render target (standard audio): {target_dir}")
-                        
-                        setup_timeline_and_render(
-                            standard_clips,
-                            timeline_name,
-                            resolution_folder_name,
-                            standard_preset,
-                            target_dir
-                        )
-                    
-                    # Process MultiAudio subfolder if it exists (>4 audio tracks)
-                    multi_audio_subfolders = resolution_folder.GetSubFolderList()
-                    for subfolder in multi_audio_subfolders:
-                        if subfolder.GetName() == "MultiAudio_5+":
-                            multi_audio_clips = subfolder.GetClipList()
-                            if multi_audio_clips:
-                                timeline_name = f"Video Resolution {resolution_folder_name} MultiAudio   #{next(c)}"
-                                
-                                # Build target directory with MultiAudio subfolder
-                                if subfolder_parts:
-                                    target_dir = os.path.join(proxy_folder_path, footage_folder_name, *subfolder_parts)
-                                else:
-                                    target_dir = os.path.join(proxy_folder_path, footage_folder_name)
-                                
-                                print(f"    Render target (multi-audio): {target_dir}")
-                                
-                                setup_timeline_and_render(
-                                    multi_audio_clips,
-                                    timeline_name,
-                                    resolution_folder_name,
-                                    multi_audio_preset,
-                                    target_dir
-                                )
+                # Plan a timeline for each resolution and audio configuration
+                planned_jobs = []
+                for resolution_folder_name, groups in clip_groups.items():
+                    # Clips directly in resolution folder (≤4 audio tracks)
+                    if groups[False]:
+                        planned_jobs.append((groups[False], resolution_folder_name, "", standard_preset,
+                                             "standard audio"))
+                    # MultiAudio clips (>4 audio tracks)
+                    if groups[True]:
+                        planned_jobs.append((groups[True], resolution_folder_name, " MultiAudio", multi_audio_preset,
+                                             "multi-audio"))
+
+                # Hold back the whole folder if its proxies do not fit the target volume, so a
+                # later run (or watch mode retry) can queue it again without duplicating jobs
+                reservation = None
+                if storage_budget is not None and planned_jobs:
+                    estimated_bytes = sum(
+                        estimate_job_bytes(clips, preset, calculate_proxy_dimensions(resolution)[0])
+                        for clips, resolution, _, preset, _ in planned_jobs)
+                    description = os.path.join(footage_folder_name, subfolder_path) if subfolder_path else footage_folder_name
+                    reservation = storage_budget.admit(target_dir, estimated_bytes, description, items)
+                    if reservation is None:
+                        print(f"    Held back, not enough free space for {format_bytes(estimated_bytes)}: {target_dir}")
+                        MediaPool.DeleteClips(uncat_clips)
+                        continue
+
+                for clips, resolution, suffix, preset, audio_label in planned_jobs:
+                    timeline_name = f"Video Resolution {resolution}{suffix}   #{next(timeline_counter)}"
+
+                    print(f"    Render target ({audio_label}): {target_dir}")
+
+                    job_id = setup_timeline_and_render(clips, timeline_name, resolution, preset, target_dir,
+                                                       clip_fingerprints)
+                    if job_id and reservation is not None:
+                        reservation['job_ids'].append(job_id)
                     
             except Exception as e:
                 print(f"    Error processing items: {e}")
                 continue
-    
-    # Save project
-    ProjectManager.SaveProject()
+
+    return job_ids
+
+def process_files_in_resolve(organized_files, selected_footage_folders, proxy_folder_path, subfolder_depth, is_directory_mode=False, clean_image=False, codec='auto', project_name=None, dedup_mode=None, wait_for_completion=False, reserve_bytes=None, space_report=False, schedule_policy=None, priority_folders=None, render_fps=None, partition_mode=None, partition_limit=None, scan_items=True, deliver_destinations=None):
+    """Process files in DaVinci Resolve, returns True if rendering was started"""
+    # Create project with appropriate name based on mode
+    ProjectManager = get_resolve().GetProjectManager()
+
+    if not project_name:
+        # Generate timestamp
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        # Create project name with timestamp
+        base_name = "proxy" if is_directory_mode else "proxy_redo"
+        project_name = f"{base_name}_{timestamp}"
+
+    # Split the work across several projects to keep each Media Pool small
+    scan_cache = {}
+    partitions = partition_organized_files(organized_files, selected_footage_folders,
+                                           partition_mode, partition_limit, scan_items, scan_cache)
+
+    fingerprint_store = open_fingerprint_store(proxy_folder_path, dedup_mode)
+    storage_budget = StorageBudget(reserve_bytes) if reserve_bytes is not None else None
+
+    projects = []
+    for i, (label, partition_files, partition_folders) in enumerate(partitions, 1):
+        name = f"{project_name}_{label}" if label else project_name
+        if len(partitions) > 1:
+            print(f"\n=== Project {i}/{len(partitions)}: {name} ===")
+        Project = open_project(ProjectManager, name)
+
+        job_ids = queue_files_in_project(Project, partition_files, partition_folders, proxy_folder_path,
+                                         clean_image=clean_image, codec=codec,
+                                         fingerprint_store=fingerprint_store, dedup_mode=dedup_mode,
+                                         storage_budget=storage_budget, scan_items=scan_items,
+                                         scan_cache=scan_cache)
+
+        # Save project
+        ProjectManager.SaveProject()
+        projects.append((name, job_ids))
+
+    if storage_budget is not None:
+        storage_budget.print_summary()
+    if fingerprint_store is not None:
+        fingerprint_store.save()
     
     # Ask if user wants to start rendering
     print("\nAll render jobs added. Start rendering now? (y/n)")
     if input().strip().lower() == 'y':
-        Project.StartRendering()
-        print("Rendering started...")
+        if len(projects) > 1:
+            render_projects_in_sequence(ProjectManager, projects, proxy_folder_path,
+                                        schedule_policy, priority_folders, render_fps,
+                                        fingerprint_store=fingerprint_store,
+                                        deliver_destinations=deliver_destinations)
+        else:
+            # Deliver each proxy folder as soon as its jobs have completed, while the rest renders
+            delivery_tracker = None
+            if deliver_destinations:
+                delivery_tracker = DeliveryTracker(proxy_folder_path, deliver_destinations)
+                delivery_tracker.add_jobs(Project, projects[0][1])
+                print(f"\nDelivering to: {', '.join(deliver_destinations)}")
+            on_poll = (lambda: delivery_tracker.poll(Project)) if delivery_tracker else None
+
+            if schedule_policy:
+                ordered_ids = schedule_render_queue(Project, schedule_policy, proxy_folder_path,
+                                                    priority_folders, render_fps)
+                render_jobs_in_order(Project, ordered_ids, on_poll=on_poll)
+            else:
+                Project.StartRendering()
+                print("Rendering started...")
+            if delivery_tracker:
+                delivery_tracker.finish(Project)
+        if wait_for_completion or space_report:
+            wait_for_render(Project)
+            print("Rendering finished.")
+            if space_report and storage_budget is not None:
+                storage_budget.print_calibration()
+        # Confirm the fingerprints of clips whose render has already finished
+        if fingerprint_store is not None and len(projects) == 1 and fingerprint_store.update_from_jobs(Project):
+            fingerprint_store.save()
+        return True
     else:
+        if len(projects) > 1:
+            print(f"{len(projects)} projects saved: {', '.join(name for name, _ in projects)}")
         print("Project saved. You can start rendering manually in DaVinci Resolve.")
+        return False
 
 def process_json_mode(json_path, proxy_path, dataset, in_depth, out_depth, 
-                      clean_image=False, filter_mode=None, filter_list=None, codec='auto'):
+                      clean_image=False, filter_mode=None, filter_list=None, codec='auto',
+                      project_name=None, dedup_mode=None, verify_path=None,
+                      reserve_bytes=None, space_report=False, schedule_policy=None,
+                      priority_folders=None, render_fps=None, partition_mode=None,
+                      partition_limit=None, scan_items=True, deliver_destinations=None):
     """Process using JSON file with input/output depth and folder filtering"""
 
     # Read JSON file
@@ -500,11 +1186,28 @@ def process_json_mode(json_path, proxy_path, dataset, in_depth, out_depth,
     selected_folders = list(organized_files.keys())
     subfolder_depth = out_depth - in_depth
     
-    process_files_in_resolve(organized_files, selected_folders, proxy_path, 
-                            subfolder_depth, is_directory_mode=False, clean_image=clean_image, codec=codec)
+    rendered = process_files_in_resolve(organized_files, selected_folders, proxy_path, 
+                            subfolder_depth, is_directory_mode=False, clean_image=clean_image, codec=codec,
+                            project_name=project_name, dedup_mode=dedup_mode,
+                            wait_for_completion=bool(verify_path),
+                            reserve_bytes=reserve_bytes, space_report=space_report,
+                            schedule_policy=schedule_policy, priority_folders=priority_folders,
+                            render_fps=render_fps, partition_mode=partition_mode,
+                            partition_limit=partition_limit, scan_items=scan_items,
+                            deliver_destinations=deliver_destinations)
+
+    if verify_path:
+        if rendered:
+            verify_proxies(selected_folders, proxy_path, in_depth, out_depth, verify_path)
+        else:
+            print("Skipping verification because rendering was not started.")
 
 def process_directory_mode(footage_path, proxy_path, in_depth, out_depth, 
-                          clean_image=False, filter_mode=None, filter_list=None, codec='auto'):
+                          clean_image=False, filter_mode=None, filter_list=None, codec='auto',
+                          project_name=None, dedup_mode=None, verify_path=None,
+                          reserve_bytes=None, space_report=False, schedule_policy=None,
+                          priority_folders=None, render_fps=None, partition_mode=None,
+                          partition_limit=None, scan_items=True, deliver_destinations=None):
     """Process footage folder with absolute input/output depths"""
 
     if not os.path.exists(footage_path):
@@ -663,13 +1366,1302 @@ def process_directory_mode(footage_path, proxy_path, in_depth, out_depth,
     selected_folders = list(organized_files.keys())
     subfolder_depth = out_depth - in_depth
     
-    process_files_in_resolve(organized_files, selected_folders, proxy_path, subfolder_depth,
-                            is_directory_mode=True, clean_image=clean_image, codec=codec)
+    rendered = process_files_in_resolve(organized_files, selected_folders, proxy_path, subfolder_depth,
+                            is_directory_mode=True, clean_image=clean_image, codec=codec,
+                            project_name=project_name, dedup_mode=dedup_mode,
+                            wait_for_completion=bool(verify_path),
+                            reserve_bytes=reserve_bytes, space_report=space_report,
+                            schedule_policy=schedule_policy, priority_folders=priority_folders,
+                            render_fps=render_fps, partition_mode=partition_mode,
+                            partition_limit=partition_limit, scan_items=scan_items,
+                            deliver_destinations=deliver_destinations)
+
+    if verify_path:
+        if rendered:
+            verify_proxies(selected_folders, proxy_path, in_depth, out_depth, verify_path)
+        else:
+            print("Skipping verification because rendering was not started.")
+
+class InotifyWaiter:
+    """Minimal inotify wrapper (Linux only) used to wake the watcher on new folders"""
+
+    IN_CREATE = 0x00000100
+    IN_MOVED_TO = 0x00000080
+    IN_ONLYDIR = 0x01000000
+    IN_IGNORED = 0x00008000
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library('c')
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | getattr(os, 'O_CLOEXEC', 0))
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watched = {}  # path -> (watch descriptor, device, inode)
+
+    def add_watch(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        watch = self.watched.get(path)
+        if watch and watch[1:] == (stat.st_dev, stat.st_ino):
+            return
+        # New directory, or one that was deleted and re-created under the same name
+        mask = self.IN_CREATE | self.IN_MOVED_TO | self.IN_ONLYDIR
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd >= 0:
+            self.watched[path] = (wd, stat.st_dev, stat.st_ino)
+
+    def prune(self, existing_paths):
+        """Drop watches on directories that were not seen in the last scan"""
+        for path in list(self.watched):
+            if path not in existing_paths:
+                # The kernel removes the watch of a deleted directory itself, so errors are expected
+                self.libc.inotify_rm_watch(self.fd, self.watched.pop(path)[0])
+
+    def wait(self, timeout):
+        """Block until an event arrives or timeout expires (None waits forever)"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        # Drain the queue, we rescan instead of using the events. Only watches removed by
+        # the kernel (directory deleted) are forgotten, so they are added again if re-created.
+        try:
+            while True:
+                data = os.read(self.fd, 65536)
+                if not data:
+                    break
+                offset = 0
+                while offset + self.EVENT_HEADER.size <= len(data):
+                    wd, mask, _, name_len = self.EVENT_HEADER.unpack_from(data, offset)
+                    offset += self.EVENT_HEADER.size + name_len
+                    if mask & self.IN_IGNORED:
+                        for path, watch in list(self.watched.items()):
+                            if watch[0] == wd:
+                                del self.watched[path]
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+def create_waiter():
+    """Return an InotifyWaiter where available, otherwise None (polling fallback)"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        return InotifyWaiter()
+    except (OSError, AttributeError):
+        return None
+
+def folder_signature(path):
+    """Return (file count, total bytes, newest mtime) for everything below path"""
+    file_count = 0
+    total_size = 0
+    newest_mtime = 0.0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        file_count += 1
+                        total_size += stat.st_size
+                        newest_mtime = max(newest_mtime, stat.st_mtime)
+                except OSError:
+                    continue
+    return file_count, total_size, newest_mtime
+
+class FolderWatcher:
+    """Report folders at out_depth once their contents have stopped changing.
+
+    New folders are picked up through inotify where available. The tree is also rescanned
+    at least every idle_interval seconds, because inotify does not see changes made by
+    other hosts on network shares. Folders in known are never reported again.
+    """
+
+    def __init__(self, footage_path, out_depth, settle=10.0, poll_interval=2.0,
+                 idle_interval=5.0, filter_names=None, in_depth=None, known=None, waiter=None):
+        self.footage_path = footage_path
+        self.out_depth = out_depth
+        self.in_depth = in_depth
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self.idle_interval = idle_interval
+        self.filter_names = set(filter_names) if filter_names else None
+        self.known = set(known or [])
+        self.pending = {}
+        self.retry_at = {}
+        self.waiter = waiter
+
+    def scan(self):
+        """Walk the tree down to out_depth, registering new candidate folders"""
+        watched_dirs = set()
+        now = time.monotonic()
+        for root, dirs, files in os.walk(self.footage_path):
+            current_depth = len([p for p in root.split(os.sep) if p])
+
+            if current_depth >= self.out_depth:
+                dirs.clear()
+                if current_depth == self.out_depth and root not in self.known and root not in self.pending:
+                    if self.accepts(root) and self.retry_at.get(root, 0) <= now:
+                        self.retry_at.pop(root, None)
+                        self.pending[root] = (None, now)
+            elif self.waiter:
+                self.waiter.add_watch(root)
+                watched_dirs.add(root)
+        if self.waiter:
+            self.waiter.prune(watched_dirs)
+
+    def retry_later(self, folder, delay):
+        """Report an already reported folder again after delay seconds (e.g. when it was held back)"""
+        self.known.discard(folder)
+        self.retry_at[folder] = time.monotonic() + delay
+
+    def accepts(self, folder):
+        if not self.filter_names or self.in_depth is None:
+            return True
+        parts = [p for p in folder.split(os.sep) if p]
+        return len(parts) >= self.in_depth and parts[self.in_depth - 1] in self.filter_names
+
+    def collect_stable(self):
+        """Return pending folders whose signature has not changed for settle seconds"""
+        now = time.monotonic()
+        ready = []
+        for folder, (previous, since) in list(self.pending.items()):
+            if not os.path.isdir(folder):
+                del self.pending[folder]
+                continue
+            signature = folder_signature(folder)
+            if signature != previous:
+                self.pending[folder] = (signature, now)
+            elif signature[0] > 0 and now - since >= self.settle:
+                ready.append(folder)
+                del self.pending[folder]
+                self.known.add(folder)
+        return sorted(ready)
+
+    def poll(self, timeout=None):
+        """Wait for activity and return the folders that became stable.
+
+        timeout caps how long to block when nothing is pending (never longer than idle_interval).
+        """
+        self.scan()
+        ready = self.collect_stable()
+        if ready:
+            return ready
+
+        if self.pending:
+            wait = self.poll_interval
+        else:
+            wait = self.idle_interval if timeout is None else min(timeout, self.idle_interval)
+
+        if self.waiter:
+            self.waiter.wait(wait)
+        else:
+            time.sleep(wait)
+        return []
+
+def load_watch_state(state_path):
+    """Return the set of folders already queued by earlier watch sessions"""
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return set(json.load(f).get('queued_folders', []))
+    except (OSError, ValueError):
+        return set()
+
+def save_watch_state(state_path, queued_folders):
+    os.makedirs(os.path.dirname(state_path), exist_ok=True)
+    tmp_path = state_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'queued_folders': sorted(queued_folders)}, f, indent=2)
+    os.replace(tmp_path, state_path)
+
+def process_watch_mode(footage_path, proxy_path, in_depth, out_depth, clean_image=False,
+                       filter_list=None, codec='auto', project_name=None, settle=10.0,
+                       dedup_mode=None, reserve_bytes=None, schedule_policy=None,
+                       priority_folders=None, scan_items=True, deliver_destinations=None,
+                       render_fps=None, resolve_app=None, stop_event=None, poll_interval=2.0,
+                       idle_interval=5.0, retry_interval=300.0):
+    """Watch the footage tree and queue new folders at out_depth as they finish copying.
+
+    Folders held back for lack of free space are retried every retry_interval seconds.
+    Runs until Ctrl+C, or until stop_event (a threading.Event) is set. resolve_app
+    defaults to the running DaVinci Resolve.
+    """
+
+    if not os.path.exists(footage_path):
+        print(f"Error: Footage folder does not exist: {footage_path}")
+        sys.exit(1)
+
+    project_name = project_name or "proxy_watch"
+    state_path = os.path.join(proxy_path, ".proxy_watch_state.json")
+    queued_folders = load_watch_state(state_path)
+    filter_names = [f.strip() for f in filter_list.split(',')] if filter_list else None
+
+    fingerprint_store = open_fingerprint_store(proxy_path, dedup_mode)
+    storage_budget = StorageBudget(reserve_bytes) if reserve_bytes is not None else None
+
+    resolve_app = resolve_app or get_resolve()
+    ProjectManager = resolve_app.GetProjectManager()
+    Project = open_project(ProjectManager, project_name)
+
+    delivery_tracker = DeliveryTracker(proxy_path, deliver_destinations) if deliver_destinations else None
+
+    waiter = create_waiter()
+    watcher = FolderWatcher(footage_path, out_depth, settle=settle, poll_interval=poll_interval,
+                            idle_interval=idle_interval, filter_names=filter_names,
+                            in_depth=in_depth, known=queued_folders, waiter=waiter)
+
+    print(f"\nWatch mode:")
+    print(f"Footage folder: {footage_path}")
+    print(f"Proxy folder: {proxy_path}")
+    print(f"Project: {project_name}")
+    print(f"Watching folders at depth {out_depth} ({'inotify' if waiter else 'polling'}), settle time {settle}s")
+    print("Press Ctrl+C to stop.")
+
+    pending_jobs = []
+    interrupted = False
+    try:
+        while stop_event is None or not stop_event.is_set():
+            # Only wake up periodically while jobs wait to be rendered or delivered
+            waiting = pending_jobs or (delivery_tracker and delivery_tracker.jobs_by_dir)
+            ready = watcher.poll(timeout=watcher.poll_interval if waiting else None)
+
+            if ready:
+                print(f"\n[{datetime.now().strftime('%H:%M:%S')}] {len(ready)} new folder(s) ready:")
+                for folder in ready:
+                    print(f"  {folder}")
+
+                if in_depth == out_depth:
+                    organized_files = organize_directory_mode_folders(ready, in_depth)
+                else:
+                    organized_files = organize_json_mode_files(ready, in_depth, out_depth)
+
+                job_ids = queue_files_in_project(Project, organized_files, list(organized_files.keys()),
+                                                 proxy_path, clean_image=clean_image, codec=codec,
+                                                 fingerprint_store=fingerprint_store, dedup_mode=dedup_mode,
+                                                 storage_budget=storage_budget, scan_items=scan_items,
+                                                 resolve_app=resolve_app)
+                ProjectManager.SaveProject()
+                if fingerprint_store is not None:
+                    fingerprint_store.save()
+
+                # Folders that did not fit stay out of the watch state and are tried again later
+                held_folders = set()
+                if storage_budget is not None:
+                    for description, target_dir, estimated_bytes, source_items in storage_budget.held_back:
+                        print(f"Held back {description} ({format_bytes(estimated_bytes)}), not enough free space "
+                              f"for {target_dir}. Retrying in {retry_interval / 60:.0f} min")
+                        held_folders.update(source_items)
+                    storage_budget.held_back.clear()
+                for folder in held_folders:
+                    watcher.retry_later(folder, retry_interval)
+
+                queued_folders.update(folder for folder in ready if folder not in held_folders)
+                save_watch_state(state_path, queued_folders)
+                pending_jobs.extend(job_ids)
+                print(f"Queued {len(job_ids)} render job(s)")
+                if schedule_policy and job_ids:
+                    jobs, measured_fps = get_schedulable_jobs(Project, proxy_path)
+                    print_schedule_report(jobs, render_fps or measured_fps or DEFAULT_RENDER_FPS, priority_folders)
+                if delivery_tracker:
+                    delivery_tracker.add_jobs(Project, job_ids)
+
+            if pending_jobs and not Project.IsRenderingInProgress():
+                if schedule_policy:
+                    # Start one job at a time so newly queued jobs can overtake older ones
+                    jobs, _ = get_schedulable_jobs(Project, proxy_path)
+                    ordered = order_render_jobs(jobs, schedule_policy, priority_folders)
+                    pending_jobs = [job['job_id'] for job in ordered]
+                    if pending_jobs:
+                        next_job = ordered[0]
+                        Project.StartRendering(next_job['job_id'])
+                        print(f"Rendering {next_job['day']}: {next_job['name']} ({len(pending_jobs) - 1} job(s) waiting)")
+                else:
+                    Project.StartRendering(*pending_jobs)
+                    print(f"Rendering started for {len(pending_jobs)} job(s)...")
+                    pending_jobs = []
+
+            if delivery_tracker:
+                delivery_tracker.poll(Project)
+            if storage_budget is not None:
+                storage_budget.release_finished(Project)
+            if fingerprint_store is not None and fingerprint_store.update_from_jobs(Project):
+                fingerprint_store.save()
+    except KeyboardInterrupt:
+        interrupted = True
+    finally:
+        if waiter:
+            waiter.close()
+
+    if delivery_tracker:
+        # Ctrl+C stops the copies in flight (resumed on the next run), a stop event lets them finish
+        delivery_tracker.close(cancel=interrupted)
+    ProjectManager.SaveProject()
+    print("\nWatch mode stopped. Project saved.")
+
+# Containers treated as source clips when pairing proxies with footage
+VIDEO_EXTENSIONS = {
+    '.mov', '.mp4', '.m4v', '.mxf', '.mts', '.m2ts', '.avi', '.mkv',
+    '.r3d', '.braw', '.crm', '.insv',
+}
+PROXY_EXTENSIONS = {'.mov', '.mp4'}
+QUICKTIME_EXTENSIONS = {'.mov', '.mp4', '.m4v', '.insv'}
+DURATION_TOLERANCE = 0.1  # seconds, used when frame counts are not available
+
+def iter_atoms(f, start, end):
+    """Yield (type, payload_start, atom_end) for the QuickTime atoms between start and end"""
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, kind = struct.unpack('>I4s', header)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            header_size = 16
+        elif size == 0:
+            size = end - offset
+        if size < header_size:
+            return
+        yield kind, offset + header_size, offset + size
+        offset += size
+
+def find_atom(f, start, end, kind):
+    for atom_kind, payload_start, atom_end in iter_atoms(f, start, end):
+        if atom_kind == kind:
+            return payload_start, atom_end
+    return None
+
+def read_media_header(f, start):
+    """Return (timescale, duration) from an mvhd or mdhd payload"""
+    f.seek(start)
+    version = f.read(1)[0]
+    if version == 1:
+        f.seek(start + 20)
+        timescale, duration = struct.unpack('>IQ', f.read(12))
+    else:
+        f.seek(start + 12)
+        timescale, duration = struct.unpack('>II', f.read(8))
+    return timescale, duration
+
+def probe_quicktime(path):
+    """Read duration, frame count and audio channel count from QuickTime/MP4 headers.
+
+    Only the atom headers are read, sample data is skipped. Returns None when the
+    file has no complete moov atom (e.g. an interrupted render).
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+
+        moov = find_atom(f, 0, file_size, b'moov')
+        if not moov or moov[1] > file_size:
+            return None
+
+        info = {'duration': None, 'frames': None, 'audio_channels': 0}
+        mvhd = find_atom(f, moov[0], moov[1], b'mvhd')
+        if mvhd:
+            timescale, duration = read_media_header(f, mvhd[0])
+            if timescale:
+                info['duration'] = duration / timescale
+
+        for kind, trak_start, trak_end in iter_atoms(f, *moov):
+            if kind != b'trak':
+                continue
+            mdia = find_atom(f, trak_start, trak_end, b'mdia')
+            hdlr = mdia and find_atom(f, mdia[0], mdia[1], b'hdlr')
+            minf = mdia and find_atom(f, mdia[0], mdia[1], b'minf')
+            stbl = minf and find_atom(f, minf[0], minf[1], b'stbl')
+            if not hdlr or not stbl:
+                continue
+
+            f.seek(hdlr[0] + 8)
+            handler_type = f.read(4)
+
+            if handler_type == b'vide' and info['frames'] is None:
+                stsz = find_atom(f, stbl[0], stbl[1], b'stsz')
+                if stsz:
+                    f.seek(stsz[0] + 8)
+                    info['frames'] = struct.unpack('>I', f.read(4))[0]
+                mdhd = find_atom(f, mdia[0], mdia[1], b'mdhd')
+                if mdhd:
+                    timescale, duration = read_media_header(f, mdhd[0])
+                    if timescale:
+                        info['duration'] = duration / timescale
+
+            elif handler_type == b'soun':
+                stsd = find_atom(f, stbl[0], stbl[1], b'stsd')
+                if stsd:
+                    # First sample description: 16 byte entry header, then the sound description
+                    entry = stsd[0] + 8
+                    f.seek(entry + 16)
+                    version = struct.unpack('>H', f.read(2))[0]
+                    if version == 2:
+                        f.seek(entry + 16 + 32)
+                        info['audio_channels'] += struct.unpack('>I', f.read(4))[0]
+                    else:
+                        f.seek(entry + 16 + 8)
+                        info['audio_channels'] += struct.unpack('>H', f.read(2))[0]
+
+        return info
+
+def probe_ffprobe(path):
+    """Fallback probe for containers without a native reader (requires ffprobe on PATH)"""
+    ffprobe = shutil.which('ffprobe')
+    if not ffprobe:
+        return None
+    try:
+        result = subprocess.run(
+            [ffprobe, '-v', 'error', '-of', 'json',
+             '-show_entries', 'stream=codec_type,nb_frames,duration,channels,r_frame_rate:format=duration',
+             path],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, timeout=60)
+        data = json.loads(result.stdout or '{}')
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+    streams = data.get('streams', [])
+    if not streams:
+        return None
+
+    info = {'duration': None, 'frames': None, 'audio_channels': 0}
+    try:
+        info['duration'] = float(data.get('format', {}).get('duration'))
+    except (TypeError, ValueError):
+        pass
+
+    for stream in streams:
+        if stream.get('codec_type') == 'video' and info['frames'] is None:
+            try:
+                info['frames'] = int(stream['nb_frames'])
+            except (KeyError, ValueError):
+                try:
+                    num, den = stream['r_frame_rate'].split('/')
+                    info['frames'] = round(float(stream['duration']) * int(num) / int(den))
+                except (KeyError, ValueError, ZeroDivisionError):
+                    pass
+        elif stream.get('codec_type') == 'audio':
+            info['audio_channels'] += int(stream.get('channels') or 0)
+    return info
+
+def probe_media(path):
+    """Return {'duration', 'frames', 'audio_channels'} for a clip, or None if it cannot be read"""
+    if os.path.splitext(path)[1].lower() in QUICKTIME_EXTENSIONS:
+        try:
+            return probe_quicktime(path)
+        except (OSError, struct.error, IndexError):
+            return None
+    return probe_ffprobe(path)
+
+def p2_audio_files(video_path):
+    """Return the CONTENTS/AUDIO files linked to a P2 CONTENTS/VIDEO clip (one per channel)"""
+    video_dir = os.path.dirname(video_path)
+    contents_dir = os.path.dirname(video_dir)
+    if (os.path.basename(video_dir).upper() != 'VIDEO'
+            or os.path.basename(contents_dir).upper() != 'CONTENTS'):
+        return []
+    stem = os.path.splitext(os.path.basename(video_path))[0].upper()
+    for name in os.listdir(contents_dir):
+        if name.upper() == 'AUDIO':
+            audio_dir = os.path.join(contents_dir, name)
+            return sorted(os.path.join(audio_dir, audio_name) for audio_name in os.listdir(audio_dir)
+                          if audio_name.upper().startswith(stem) and audio_name.upper().endswith('.MXF'))
+    return []
+
+def probe_pair(pair):
+    """Process pool worker: probe a (source, proxy) pair.
+
+    P2 video MXFs carry no audio, so their channel count is taken from the linked
+    CONTENTS/AUDIO files, as Resolve does when it imports the card.
+    """
+    source_path, proxy_path = pair
+    source_info = probe_media(source_path)
+    if source_info is not None:
+        try:
+            audio_files = p2_audio_files(source_path)
+        except OSError:
+            audio_files = []
+        if audio_files:
+            source_info['audio_channels'] = len(audio_files)
+    return source_path, proxy_path, source_info, probe_media(proxy_path)
+
+def compare_media(source_info, proxy_info):
+    """Return the list of reasons a proxy does not match its source (empty if it matches)"""
+    if proxy_info is None:
+        return ['proxy unreadable']
+
+    reasons = []
+    if source_info['frames'] is not None and proxy_info['frames'] is not None:
+        if source_info['frames'] != proxy_info['frames']:
+            reasons.append('frame count')
+    elif source_info['duration'] is not None and proxy_info['duration'] is not None:
+        if abs(source_info['duration'] - proxy_info['duration']) > DURATION_TOLERANCE:
+            reasons.append('duration')
+
+    if source_info['audio_channels'] != proxy_info['audio_channels']:
+        reasons.append('audio channels')
+    return reasons
+
+def pair_proxies_with_sources(source_roots, proxy_folder_path, in_depth, out_depth):
+    """Match source clips with rendered proxies using the same layout the render jobs use.
+
+    A clip at <in_depth folder>/<subfolders up to out_depth>/.../name.ext is rendered to
+    <proxy>/<in_depth folder name>/<subfolders>/name.<proxy ext>. Sources are selected
+    with the rules of scan_media_items: card sidecar folders (camera proxies), P2 audio
+    files and R3D span segments after the first do not get a proxy of their own.
+    Returns (pairs, sources_without_proxy, proxies_without_source).
+    """
+    sources = {}
+    proxy_roots = set()
+    for source_root in source_roots:
+        footage_folder_name = os.path.basename(source_root.rstrip(os.sep))
+        proxy_roots.add(os.path.join(proxy_folder_path, footage_folder_name))
+        for root, dirs, files in os.walk(source_root):
+            dirs[:] = [d for d in dirs if not d.startswith('.')
+                       and not is_sidecar_directory(root, os.path.join(root, d))]
+            dir_parts = [p for p in root.split(os.sep) if p]
+            subfolder_parts = dir_parts[in_depth:out_depth]
+            # P2 audio is linked to the clips in CONTENTS/VIDEO, not rendered on its own
+            if (len(dir_parts) >= 2 and dir_parts[-1].upper() == 'AUDIO'
+                    and dir_parts[-2].upper() == 'CONTENTS'):
+                continue
+            for name in files:
+                stem, ext = os.path.splitext(name)
+                if ext.lower() not in VIDEO_EXTENSIONS or name.startswith('.'):
+                    continue
+                span = R3D_SPAN_PATTERN.search(name)
+                if span and span.group(1) != '001':
+                    continue
+                key = (footage_folder_name, *subfolder_parts, stem)
+                sources[key] = os.path.join(root, name)
+
+    proxies = {}
+    for proxy_root in proxy_roots:
+        for root, dirs, files in os.walk(proxy_root):
+            rel_parts = [p for p in os.path.relpath(root, proxy_folder_path).split(os.sep) if p != '.']
+            for name in files:
+                stem, ext = os.path.splitext(name)
+                if ext.lower() in PROXY_EXTENSIONS and not name.startswith('.'):
+                    proxies[(*rel_parts, stem)] = os.path.join(root, name)
+
+    pairs = [(sources[key], proxies[key]) for key in sorted(sources) if key in proxies]
+    sources_without_proxy = sorted(sources[key] for key in sources if key not in proxies)
+    proxies_without_source = sorted(proxies[key] for key in proxies if key not in sources)
+    return pairs, sources_without_proxy, proxies_without_source
+
+def verify_proxies(source_roots, proxy_folder_path, in_depth, out_depth, output_path, workers=None):
+    """Compare every proxy with its source and write a File_Compare compatible JSON report.
+
+    The report can be fed back with -j <report> -d 1 to re-queue exactly the failures.
+    """
+    print(f"\nVerifying proxies in {proxy_folder_path}")
+    pairs, sources_without_proxy, proxies_without_source = pair_proxies_with_sources(
+        source_roots, proxy_folder_path, in_depth, out_depth)
+    print(f"Found {len(pairs)} proxy/source pairs, {len(sources_without_proxy)} sources without proxy")
+
+    start_time = time.monotonic()
+    mismatches = []
+    unverified = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for source_path, proxy_path, source_info, proxy_info in executor.map(probe_pair, pairs, chunksize=16):
+            if source_info is None:
+                unverified.append(source_path)
+                continue
+            reasons = compare_media(source_info, proxy_info)
+            if reasons:
+                proxy_info = proxy_info or {}
+                mismatches.append({
+                    'path1': source_path,
+                    'path2': proxy_path,
+                    'frames1': source_info['frames'],
+                    'frames2': proxy_info.get('frames'),
+                    'duration1': source_info['duration'],
+                    'duration2': proxy_info.get('duration'),
+                    'audio_channels1': source_info['audio_channels'],
+                    'audio_channels2': proxy_info.get('audio_channels'),
+                    'reasons': reasons,
+                })
+    elapsed = time.monotonic() - start_time
+
+    report = {
+        'files_only_in_group1': sources_without_proxy,
+        'files_only_in_group2': proxies_without_source,
+        'frame_count_mismatches': mismatches,
+        'unverified': unverified,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"Verified {len(pairs)} pairs in {elapsed:.1f}s")
+    print(f"  Mismatches: {len(mismatches)}")
+    print(f"  Missing proxies: {len(sources_without_proxy)}")
+    if unverified:
+        print(f"  Sources that could not be read: {len(unverified)}")
+    print(f"Report written to {output_path}")
+    if mismatches or sources_without_proxy:
+        print(f"Re-queue failures with: -j \"{output_path}\" -d 1 -p \"{proxy_folder_path}\" -i {in_depth} -o {out_depth}")
+    return report
+
+def wait_for_render(Project, poll_interval=5, on_poll=None):
+    """Block until the current render has finished, calling on_poll() while waiting"""
+    while Project.IsRenderingInProgress():
+        if on_poll:
+            on_poll()
+        time.sleep(poll_interval)
+
+def find_folders_at_depth(footage_path, depth, filter_list=None):
+    """Return folders at an absolute depth within the footage tree, optionally filtered by name"""
+    filter_names = [f.strip() for f in filter_list.split(',')] if filter_list else None
+    folders = []
+    for root, dirs, files in os.walk(footage_path):
+        current_depth = len([p for p in root.split(os.sep) if p])
+        if current_depth >= depth:
+            dirs.clear()
+            if current_depth == depth and (not filter_names or os.path.basename(root) in filter_names):
+                folders.append(root)
+    return sorted(folders)
 
 def is_json_file(path):
     """Check if the path is likely a JSON file"""
     return path.lower().endswith('.json') or (os.path.isfile(path) and not os.path.isdir(path))
 
+SCHEDULE_POLICIES = ('queue', 'newest-day', 'shortest-job', 'priority')
+DEFAULT_RENDER_FPS = 100.0  # frames rendered per second when there is no render history yet
+
+def natural_sort_key(name):
+    """Sort key that orders Shooting_Day_10 after Shooting_Day_9"""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+def get_schedulable_jobs(Project, proxy_folder_path):
+    """Return the project's render jobs that have not rendered yet, with day folder and frame count.
+
+    The day of a job is the first folder of its target below proxy_folder_path (jobs
+    writing elsewhere use their whole target folder). Also returns the render speed
+    (frames per second) measured from completed jobs, or None.
+    """
+    jobs = Project.GetRenderJobList() or []
+    if not jobs:
+        return [], None
+
+    root = os.path.normpath(proxy_folder_path)
+    pending = []
+    rendered_frames = 0
+    render_ms = 0
+    for job in jobs:
+        try:
+            frames = int(job.get('MarkOut', 0)) - int(job.get('MarkIn', 0)) + 1
+        except (TypeError, ValueError):
+            frames = 0
+        status = Project.GetRenderJobStatus(job['JobId']) or {}
+
+        if status.get('JobStatus') == 'Complete':
+            if status.get('TimeTakenToRenderInMs'):
+                rendered_frames += frames
+                render_ms += status['TimeTakenToRenderInMs']
+            continue
+        if status.get('JobStatus', 'Ready') != 'Ready':
+            continue
+
+        target_dir = job.get('TargetDir', '')
+        if os.path.normpath(target_dir).startswith(root + os.sep):
+            day = os.path.relpath(target_dir, root).split(os.sep)[0]
+        else:
+            day = target_dir
+
+        pending.append({
+            'job_id': job['JobId'],
+            'name': job.get('TimelineName') or job.get('RenderJobName', ''),
+            'target_dir': target_dir,
+            'day': day,
+            'frames': max(frames, 0),
+        })
+
+    measured_fps = rendered_frames / (render_ms / 1000) if render_ms else None
+    return pending, measured_fps
+
+def order_render_jobs(jobs, policy, priority_folders=None):
+    """Return jobs sorted by the scheduling policy (sorts are stable, so ties keep queue order)"""
+    if policy == 'newest-day':
+        return sorted(jobs, key=lambda job: natural_sort_key(job['day']), reverse=True)
+    elif policy == 'shortest-job':
+        return sorted(jobs, key=lambda job: job['frames'])
+    elif policy == 'priority':
+        ranks = {name: i for i, name in enumerate(priority_folders or [])}
+        return sorted(jobs, key=lambda job: ranks.get(job['day'], len(ranks)))
+    return list(jobs)
+
+def time_to_first_complete_day(ordered_jobs, render_fps):
+    """Return (day, seconds) of the first day folder whose jobs have all rendered"""
+    remaining = {}
+    for job in ordered_jobs:
+        remaining[job['day']] = remaining.get(job['day'], 0) + 1
+
+    elapsed = 0.0
+    for job in ordered_jobs:
+        elapsed += job['frames'] / render_fps
+        remaining[job['day']] -= 1
+        if remaining[job['day']] == 0:
+            return job['day'], elapsed
+    return None, 0.0
+
+def print_schedule_report(jobs, render_fps, priority_folders=None):
+    """Print the expected time until the first day folder is complete under each policy"""
+    print(f"\n=== Render Schedule ({len(jobs)} jobs, {render_fps:.0f} frames/s) ===")
+    for policy in SCHEDULE_POLICIES:
+        if policy == 'priority' and not priority_folders:
+            continue
+        day, seconds = time_to_first_complete_day(order_render_jobs(jobs, policy, priority_folders), render_fps)
+        if day is not None:
+            print(f"  {policy:<13} first complete day: {day} after {seconds / 60:.1f} min")
+
+def render_jobs_in_order(Project, job_ids, poll_interval=2, on_poll=None):
+    """Render jobs one at a time in the given order, waiting for each to finish.
+
+    Each job is given poll_interval seconds to start before its progress is polled.
+    on_poll() is called while waiting and after each job, e.g. to deliver finished folders.
+    """
+    for i, job_id in enumerate(job_ids, 1):
+        print(f"Rendering job {i}/{len(job_ids)}: {job_id}")
+        Project.StartRendering(job_id)
+        time.sleep(poll_interval)
+        wait_for_render(Project, poll_interval, on_poll)
+        if on_poll:
+            on_poll()
+
+def schedule_render_queue(Project, policy, proxy_folder_path, priority_folders=None, render_fps=None):
+    """Return the ids of the project's pending render jobs, ordered by policy.
+
+    Resolve's render queue itself is left unchanged; the order only holds while
+    render_jobs_in_order starts the jobs one at a time, so the script has to keep
+    running until the queue has finished.
+    """
+    jobs, measured_fps = get_schedulable_jobs(Project, proxy_folder_path)
+    if not jobs:
+        print("No pending render jobs to schedule.")
+        return []
+
+    render_fps = render_fps or measured_fps or DEFAULT_RENDER_FPS
+    print_schedule_report(jobs, render_fps, priority_folders)
+
+    ordered = order_render_jobs(jobs, policy, priority_folders)
+    print(f"\nRender order ({policy}):")
+    for job in ordered:
+        print(f"  {job['day']}: {job['name']} ({job['frames']} frames)")
+    return [job['job_id'] for job in ordered]
+
+PARTITION_MODES = ('none', 'folder', 'clips', 'duration')
+DEFAULT_PARTITION_LIMITS = {'clips': 1000, 'duration': 600}  # clips / minutes per project
+DEFAULT_SEQUENCE_FPS = 24.0  # image sequence frames carry no reliable frame rate
+
+def list_video_files(items):
+    """Return the video files among items and below the folders in items"""
+    video_files = []
+    for item in items:
+        if not os.path.isdir(item):
+            video_files.append(item)
+            continue
+        for root, dirs, files in os.walk(item):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            video_files.extend(os.path.join(root, name) for name in sorted(files)
+                               if os.path.splitext(name)[1].lower() in VIDEO_EXTENSIONS and not name.startswith('.'))
+    return video_files
+
+def media_duration(path):
+    """Return the duration of a clip in seconds, or None if it cannot be read.
+
+    Card folders passed through by scan_media_items are measured by their video files.
+    """
+    if not os.path.isdir(path):
+        return (probe_media(path) or {}).get('duration')
+
+    total = None
+    for root, dirs, files in os.walk(path):
+        # P2 keeps the audio of each clip in separate MXFs, which would count twice
+        dirs[:] = [d for d in dirs if d.upper() not in SIDECAR_DIRECTORIES | {'AUDIO'}]
+        for name in files:
+            if os.path.splitext(name)[1].lower() in VIDEO_EXTENSIONS and not name.startswith('.'):
+                duration = (probe_media(os.path.join(root, name)) or {}).get('duration')
+                if duration is not None:
+                    total = (total or 0.0) + duration
+    return total
+
+def partition_organized_files(organized_files, selected_footage_folders, partition_mode=None, partition_limit=None,
+                              scan_items=True, scan_cache=None):
+    """Split organized files into [(label, organized_files, footage_folders), ...], one entry per project.
+
+    'folder' makes one project per input depth folder, labelled with the folder name so a
+    persistent project always gets the same folder. 'clips' and 'duration' pack subfolder
+    groups in order until the clip count or media duration (minutes) reaches
+    partition_limit, labelled part01, part02, ... A single subfolder group is never
+    split across projects. The label is None when the work is not split.
+
+    Groups are measured the way they will be imported: with scan_items through
+    scan_media_items (results are stored in scan_cache, keyed by the group's items, so
+    queue_files_in_project does not scan them again), otherwise by the video files below
+    the folders handed to Resolve.
+    """
+    if partition_mode in (None, 'none'):
+        return [(None, organized_files, selected_footage_folders)]
+
+    if partition_mode == 'folder':
+        return [(os.path.basename(folder.rstrip(os.sep)), {folder: organized_files[folder]}, [folder])
+                for folder in selected_footage_folders]
+
+    limit = partition_limit or DEFAULT_PARTITION_LIMITS[partition_mode]
+    units = [(folder, subfolder_key, items)
+             for folder in selected_footage_folders
+             for subfolder_key, items in sorted(organized_files[folder].items())]
+
+    def scan_group(items):
+        existing_items = [item for item in items if os.path.exists(item)]
+        if not scan_items:
+            return existing_items, []
+        scanned = scan_media_items(existing_items)
+        if scan_cache is not None:
+            scan_cache[tuple(items)] = scanned
+        return scanned
+
+    print(f"\nMeasuring {len(units)} folder groups for project partitioning ({partition_mode})...")
+    weights = []
+    if partition_mode == 'clips':
+        for folder, subfolder_key, items in units:
+            clip_files, sequences = scan_group(items)
+            if not scan_items:
+                clip_files = list_video_files(clip_files)
+            weights.append(len(clip_files) + len(sequences))
+    else:
+        unreadable = 0
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for folder, subfolder_key, items in units:
+                clip_files, sequences = scan_group(items)
+                seconds = sum((sequence['EndIndex'] - sequence['StartIndex'] + 1) / DEFAULT_SEQUENCE_FPS
+                              for sequence in sequences)
+                for duration in executor.map(media_duration, clip_files):
+                    if duration is None:
+                        unreadable += 1
+                    else:
+                        seconds += duration
+                weights.append(seconds / 60)
+
+        if unreadable:
+            hint = "" if shutil.which('ffprobe') else " (install ffprobe to read MXF, R3D, BRAW and other non-QuickTime clips)"
+            if not any(weights):
+                print(f"Error: Could not read the duration of any of {unreadable} clip(s){hint}. "
+                      f"Use --partition clips instead.")
+                sys.exit(1)
+            print(f"Warning: Could not read the duration of {unreadable} clip(s){hint}. "
+                  f"They are counted as 0 minutes.")
+
+    partitions = []
+    current = {}
+    current_weight = 0
+    for (folder, subfolder_key, items), weight in zip(units, weights):
+        if current and current_weight + weight > limit:
+            partitions.append(current)
+            current = {}
+            current_weight = 0
+        current.setdefault(folder, {})[subfolder_key] = items
+        current_weight += weight
+    if current:
+        partitions.append(current)
+
+    unit_name = 'clips' if partition_mode == 'clips' else 'minutes'
+    print(f"Split into {len(partitions)} projects of at most {limit} {unit_name}")
+    if len(partitions) == 1:
+        return [(None, partitions[0], list(partitions[0].keys()))]
+    return [(f"part{i:02d}", partition, list(partition.keys())) for i, partition in enumerate(partitions, 1)]
+
+def render_projects_in_sequence(ProjectManager, projects, proxy_folder_path=None, schedule_policy=None,
+                                priority_folders=None, render_fps=None, fingerprint_store=None,
+                                deliver_destinations=None, poll_interval=5):
+    """Render each (project name, job ids) in turn, with one progress line and summary for all of them.
+
+    With deliver_destinations, each proxy folder is delivered as soon as its jobs have completed.
+    """
+    total_jobs = sum(len(job_ids) for _, job_ids in projects)
+    finished_jobs = 0
+    summary = []
+
+    for i, (name, job_ids) in enumerate(projects, 1):
+        if not job_ids:
+            summary.append((name, 0, 0, 0))
+            continue
+
+        Project = ProjectManager.LoadProject(name)
+        if not Project:
+            print(f"\nError: could not load project {name}")
+            summary.append((name, len(job_ids), 0, len(job_ids)))
+            finished_jobs += len(job_ids)
+            continue
+
+        print(f"\n=== Rendering project {i}/{len(projects)}: {name} ({len(job_ids)} jobs) ===")
+        delivery_tracker = None
+        if deliver_destinations:
+            delivery_tracker = DeliveryTracker(proxy_folder_path, deliver_destinations)
+            delivery_tracker.add_jobs(Project, job_ids)
+        on_poll = (lambda: delivery_tracker.poll(Project)) if delivery_tracker else None
+
+        if schedule_policy:
+            ordered_ids = schedule_render_queue(Project, schedule_policy, proxy_folder_path,
+                                                priority_folders, render_fps)
+            render_jobs_in_order(Project, ordered_ids, on_poll=on_poll)
+        else:
+            Project.StartRendering(*job_ids)
+            time.sleep(poll_interval)
+            while Project.IsRenderingInProgress():
+                statuses = [Project.GetRenderJobStatus(job_id) or {} for job_id in job_ids]
+                project_percent = sum(s.get('CompletionPercentage', 0) for s in statuses) / len(job_ids)
+                overall_percent = (finished_jobs * 100 + project_percent * len(job_ids)) / total_jobs
+                print(f"\r  {name}: {project_percent:5.1f}%   overall: {overall_percent:5.1f}%", end='', flush=True)
+                if on_poll:
+                    on_poll()
+                time.sleep(poll_interval)
+            print()
+        if delivery_tracker:
+            delivery_tracker.finish(Project, poll_interval)
+
+        if fingerprint_store is not None and fingerprint_store.update_from_jobs(Project):
+            fingerprint_store.save()
+
+        statuses = [(Project.GetRenderJobStatus(job_id) or {}).get('JobStatus') for job_id in job_ids]
+        completed = statuses.count('Complete')
+        summary.append((name, len(job_ids), completed, len(job_ids) - completed))
+        finished_jobs += len(job_ids)
+
+    print("\n=== Render Summary ===")
+    for name, queued, completed, failed in summary:
+        print(f"{name}: {completed}/{queued} jobs complete" + (f", {failed} not complete" if failed else ""))
+    total_completed = sum(completed for _, _, completed, _ in summary)
+    print(f"Total: {total_completed}/{total_jobs} jobs complete across {len(projects)} projects")
+
+DELIVERY_CHUNK_SIZE = 8 * 1024 * 1024
+DELIVERY_MANIFEST_NAME = ".proxy_delivery_manifest.json"
+MANIFEST_SAVE_INTERVAL = 2.0  # seconds, progress lost by an interrupted delivery is at most this old
+
+def file_crc32(path, chunk_size=DELIVERY_CHUNK_SIZE):
+    crc = 0
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return crc
+            crc = zlib.crc32(chunk, crc)
+
+def fan_out_copy(source_path, dest_paths, chunk_size=DELIVERY_CHUNK_SIZE, cancel=None):
+    """Copy source_path to every path in dest_paths, reading the source only once.
+
+    Each destination is written by its own thread to <dest>.partial. Returns the
+    CRC32 of the source and a {dest_path: error} dict for destinations that failed.
+    Setting the cancel event stops the copy, every destination then fails.
+    """
+    queues = [queue.Queue(maxsize=4) for _ in dest_paths]
+    errors = {}
+
+    def writer(dest_path, chunks):
+        try:
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            with open(dest_path + '.partial', 'wb') as f:
+                while True:
+                    chunk = chunks.get()
+                    if chunk is None:
+                        return
+                    f.write(chunk)
+        except OSError as e:
+            errors[dest_path] = e
+            # Keep consuming so the reader is never blocked by a failed destination
+            while chunks.get() is not None:
+                pass
+
+    threads = [threading.Thread(target=writer, args=(dest_path, chunks), daemon=True)
+               for dest_path, chunks in zip(dest_paths, queues)]
+    for thread in threads:
+        thread.start()
+
+    crc = 0
+    try:
+        with open(source_path, 'rb') as f:
+            while True:
+                if cancel is not None and cancel.is_set():
+                    raise InterruptedError("delivery cancelled")
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                crc = zlib.crc32(chunk, crc)
+                for chunks in queues:
+                    chunks.put(chunk)
+    except OSError as e:
+        for dest_path in dest_paths:
+            errors.setdefault(dest_path, e)
+    finally:
+        for chunks in queues:
+            chunks.put(None)
+        for thread in threads:
+            thread.join()
+    return crc, errors
+
+class DeliveryManifest:
+    """Record of files delivered to one destination, used to verify and resume deliveries"""
+
+    def __init__(self, dest_root):
+        self.dest_root = dest_root
+        self.path = os.path.join(dest_root, DELIVERY_MANIFEST_NAME)
+        self.lock = threading.RLock()
+        self.dirty = False
+        self.saved_at = time.monotonic()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def is_delivered(self, rel_path, source_stat):
+        entry = self.entries.get(rel_path)
+        if not entry or entry['size'] != source_stat.st_size or entry['mtime'] != source_stat.st_mtime:
+            return False
+        try:
+            return os.path.getsize(os.path.join(self.dest_root, rel_path)) == entry['size']
+        except OSError:
+            return False
+
+    def record(self, rel_path, source_stat, crc):
+        with self.lock:
+            self.entries[rel_path] = {
+                'size': source_stat.st_size,
+                'mtime': source_stat.st_mtime,
+                'crc32': f"{crc:08x}",
+                'delivered': datetime.now().isoformat(timespec='seconds'),
+            }
+            self.dirty = True
+
+    def save(self):
+        with self.lock:
+            os.makedirs(self.dest_root, exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=1)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+            self.saved_at = time.monotonic()
+
+    def save_if_due(self, interval=MANIFEST_SAVE_INTERVAL):
+        """Save recorded progress, at most once per interval so large deliveries stay cheap"""
+        with self.lock:
+            if self.dirty and time.monotonic() - self.saved_at >= interval:
+                self.save()
+
+def remove_stale_partials(folders):
+    """Delete .partial files left behind by interrupted deliveries"""
+    for folder in folders:
+        try:
+            names = os.listdir(folder)
+        except OSError:
+            continue
+        for name in names:
+            if name.endswith('.partial'):
+                try:
+                    os.remove(os.path.join(folder, name))
+                except OSError:
+                    pass
+
+def deliver_files(source_files, proxy_folder_path, destinations, workers=4, cancel=None):
+    """Deliver proxies to every destination, keeping their path relative to the proxy folder.
+
+    Files already in a destination's manifest with the same size and mtime are
+    skipped. Manifests are saved as files complete and on Ctrl+C, so an interrupted
+    delivery can simply be run again. Setting the cancel event (a threading.Event)
+    stops the delivery the same way Ctrl+C does.
+    """
+    manifests = [DeliveryManifest(dest_root) for dest_root in destinations]
+    totals = {'copied': 0, 'skipped': 0, 'failed': 0, 'bytes': 0}
+    totals_lock = threading.Lock()
+    if cancel is None:
+        cancel = threading.Event()
+
+    rel_dirs = {os.path.dirname(os.path.relpath(path, proxy_folder_path)) for path in source_files}
+    remove_stale_partials(os.path.join(dest_root, rel_dir) for dest_root in destinations for rel_dir in rel_dirs)
+
+    def deliver_one(source_path):
+        if cancel.is_set():
+            return
+        rel_path = os.path.relpath(source_path, proxy_folder_path)
+        try:
+            source_stat = os.stat(source_path)
+        except OSError as e:
+            # Renamed or removed since the folder was listed
+            print(f"  Failed to deliver {rel_path}: {e}")
+            with totals_lock:
+                totals['failed'] += 1
+            return
+        pending = [manifest for manifest in manifests if not manifest.is_delivered(rel_path, source_stat)]
+        if not pending:
+            with totals_lock:
+                totals['skipped'] += 1
+            return
+
+        dest_paths = [os.path.join(manifest.dest_root, rel_path) for manifest in pending]
+        crc, errors = fan_out_copy(source_path, dest_paths, cancel=cancel)
+
+        for manifest, dest_path in zip(pending, dest_paths):
+            partial_path = dest_path + '.partial'
+            error = errors.get(dest_path)
+            if not error:
+                try:
+                    if file_crc32(partial_path) == crc:
+                        os.replace(partial_path, dest_path)
+                        manifest.record(rel_path, source_stat, crc)
+                    else:
+                        error = "checksum mismatch"
+                except OSError as e:
+                    error = e
+            if error:
+                if not cancel.is_set():
+                    print(f"  Failed to deliver {rel_path} to {manifest.dest_root}: {error}")
+                try:
+                    os.remove(partial_path)
+                except OSError:
+                    pass
+            else:
+                try:
+                    manifest.save_if_due()
+                except OSError:
+                    pass
+            with totals_lock:
+                if error:
+                    totals['failed'] += 1
+                else:
+                    totals['copied'] += 1
+                    totals['bytes'] += source_stat.st_size
+
+    start_time = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        list(executor.map(deliver_one, source_files))
+    except KeyboardInterrupt:
+        # Stop the copies in flight and keep what has been delivered so far
+        cancel.set()
+        print("\nDelivery interrupted, saving progress...")
+        raise
+    finally:
+        executor.shutdown(wait=True)
+        for manifest in manifests:
+            try:
+                manifest.save()
+            except OSError as e:
+                print(f"  Could not write delivery manifest in {manifest.dest_root}: {e}")
+    elapsed = time.monotonic() - start_time
+
+    rate = totals['bytes'] / elapsed / 1e6 if elapsed else 0
+    print(f"Delivered {totals['copied']} copies ({format_bytes(totals['bytes'])}, {rate:.0f} MB/s written), "
+          f"{totals['skipped']} files already delivered, {totals['failed']} failed")
+    return totals
+
+def list_deliverable_files(folder, recursive=False):
+    """Return the finished proxy files in folder (hidden and partial files are left out)"""
+    files = []
+    for root, dirs, names in os.walk(folder):
+        dirs[:] = [d for d in dirs if not d.startswith('.')] if recursive else []
+        files.extend(os.path.join(root, name) for name in names
+                     if not name.startswith('.') and not name.endswith(('.partial', '.tmp'))
+                     and os.path.isfile(os.path.join(root, name)))
+    return sorted(files)
+
+class DeliveryTracker:
+    """Deliver each proxy folder once every render job writing to it has completed.
+
+    Deliveries run one folder at a time on a background thread, so polling never holds
+    up the render queue or the watch loop. Folders with a failed or cancelled job are
+    not delivered, so truncated proxies never reach the destinations; they are
+    reported instead.
+    """
+
+    FINISHED_STATUSES = ('Complete', 'Failed', 'Cancelled')
+
+    def __init__(self, proxy_folder_path, destinations):
+        self.proxy_folder_path = proxy_folder_path
+        self.destinations = destinations
+        self.jobs_by_dir = {}
+        self.failed_dirs = []
+        self.cancel = threading.Event()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.deliveries = []
+
+    def add_jobs(self, Project, job_ids):
+        job_ids = set(job_ids)
+        for job in Project.GetRenderJobList() or []:
+            if job['JobId'] in job_ids:
+                self.jobs_by_dir.setdefault(job.get('TargetDir', ''), set()).add(job['JobId'])
+
+    def deliver_folder(self, target_dir):
+        print(f"\nDelivering {target_dir}")
+        deliver_files(list_deliverable_files(target_dir), self.proxy_folder_path, self.destinations,
+                      cancel=self.cancel)
+
+    def poll(self, Project):
+        """Start delivering folders whose jobs have all completed, returns True while jobs are outstanding"""
+        for target_dir, job_ids in list(self.jobs_by_dir.items()):
+            statuses = [(Project.GetRenderJobStatus(job_id) or {}).get('JobStatus') for job_id in job_ids]
+            if not all(status in self.FINISHED_STATUSES for status in statuses):
+                continue
+            del self.jobs_by_dir[target_dir]
+            failed = len(statuses) - statuses.count('Complete')
+            if failed:
+                print(f"\nNot delivering {target_dir}: {failed} render job(s) failed or were cancelled")
+                self.failed_dirs.append(target_dir)
+                continue
+            self.deliveries.append(self.executor.submit(self.deliver_folder, target_dir))
+        return bool(self.jobs_by_dir)
+
+    def close(self, cancel=False):
+        """Wait for the deliveries started so far (or stop them with cancel=True), ending the tracking"""
+        if cancel:
+            self.cancel.set()
+        self.executor.shutdown(wait=True)
+        for delivery in self.deliveries:
+            error = delivery.exception()
+            if error:
+                print(f"Delivery failed: {error}")
+
+    def finish(self, Project, poll_interval=5):
+        """Keep delivering until rendering has stopped, then report the folders that were not delivered"""
+        try:
+            time.sleep(poll_interval)
+            while self.poll(Project) and Project.IsRenderingInProgress():
+                time.sleep(poll_interval)
+            self.poll(Project)
+            self.close()
+        except KeyboardInterrupt:
+            print("\nDelivery interrupted, saving progress...")
+            self.close(cancel=True)
+            raise
+
+        not_delivered = self.failed_dirs + sorted(self.jobs_by_dir)
+        if not_delivered:
+            print(f"\nNot delivered ({len(not_delivered)} folder(s) with failed or unfinished render jobs):")
+            for target_dir in not_delivered:
+                print(f"  {target_dir}")
+        print("Delivery finished.")
+
+def resolve_verify_path(verify_arg, proxy_path):
+    """Return the verification report path for --verify, or None if verification is off"""
+    if verify_arg is None:
+        return None
+    return verify_arg or os.path.join(proxy_path, "proxy_verify.json")
+
 def main():
     parser = argparse.ArgumentParser(
         description='''DaVinci Resolve Proxy Generator
@@ -696,6 +2688,9 @@ up to the specified subfolder level.''',
 
   Direct filtering
     %(prog)s -f /volume/Production/Footage/ -p /proxy -i 4 -o 5 --filter "Shooting_Day_2,Shooting_Day_3"  # Specific Date
+
+  Watch mode (queue new cards as they are offloaded)
+    %(prog)s -f /volume/Production/Footage/ -p /proxy -i 4 -o 5 --watch --project Show_Proxies
 '''
     )
     
@@ -730,77 +2725,100 @@ up to the specified subfolder level.''',
                              "'h265/hevc/265' → FHD_h.265_420_8bit_5Mbps, "
                              "default: auto(automatically selects the codec based on the number of audio channels in the video file)")
     
+    # Persistent project and watch mode
+    parser.add_argument('--project', type=str,
+                        help='Name of a persistent project to load (or create) instead of a new timestamped project')
+    parser.add_argument('-w', '--watch', action='store_true',
+                        help='Keep running and queue new folders at output depth once they finish copying (Directory mode only)')
+    parser.add_argument('--settle', type=float, default=10.0,
+                        help='Seconds a new folder must stay unchanged before it is queued in watch mode (default: 10)')
+
+    # Duplicate footage detection
+    parser.add_argument('--dedup', choices=['off', 'skip', 'link'], default='off',
+                        help="Detect clips already queued from another path (e.g. a second offload of the same card): "
+                             "'skip' leaves them out, 'link' also symlinks the existing proxy into the new proxy folder "
+                             "(default: off)")
+
+    # Proxy verification
+    parser.add_argument('--verify', nargs='?', const='', metavar='REPORT',
+                        help='After rendering, compare every proxy with its source (duration, frame count, audio channels) '
+                             'and write a File_Compare compatible JSON report (default: <proxy>/proxy_verify.json)')
+    parser.add_argument('--verify-only', action='store_true',
+                        help='Only verify an existing proxy tree against the footage folder, without rendering (Directory mode only)')
+
+    # Proxy storage admission control
+    parser.add_argument('--reserve', type=float, default=5.0, metavar='GB',
+                        help='Free space (GB) to keep on every proxy volume; render jobs whose estimated size '
+                             'does not fit are held back (default: 5)')
+    parser.add_argument('--space-report', action='store_true',
+                        help='Wait for rendering to finish and compare estimated with actual proxy sizes')
+
+    # Render queue scheduling
+    parser.add_argument('--schedule', choices=SCHEDULE_POLICIES,
+                        help="Order in which pending render jobs are rendered: 'newest-day' renders the latest "
+                             "shooting day first, 'shortest-job' finishes the most clips per hour, 'priority' "
+                             "follows --priority. With --project, -p and no footage, reorders that project's queue")
+    parser.add_argument('--priority', type=str,
+                        help='Comma-separated list of folder names at input depth to render first (implies --schedule priority)')
+    parser.add_argument('--render-fps', type=float,
+                        help='Render speed in frames per second used for schedule estimates '
+                             '(default: measured from completed jobs, otherwise 100)')
+
+    # Project partitioning
+    parser.add_argument('--partition', choices=PARTITION_MODES, default='none',
+                        help="Split the work across several projects to keep each Media Pool small: 'folder' makes "
+                             "one project per input depth folder, 'clips' and 'duration' cap each project at "
+                             "--partition-limit clips or minutes of media (default: none)")
+    parser.add_argument('--partition-limit', type=int,
+                        help='Maximum clips (--partition clips, default: 1000) or minutes of media '
+                             '(--partition duration, default: 600) per project')
+
+    # Footage scanning
+    parser.add_argument('--import-folders', action='store_true',
+                        help='Pass folders to Resolve as-is instead of scanning them '
+                             '(disables image sequence collapsing and sidecar filtering)')
+
+    # Proxy delivery
+    parser.add_argument('--deliver', type=str, metavar='DEST[,DEST...]',
+                        help='Comma-separated list of folders (e.g. editor shuttle drives) to copy finished proxies to, '
+                             'verified with a checksum and resumable. With only -p, delivers the existing proxy folder')
+
     # Handle positional arguments for backward compatibility
     parser.add_argument('args', nargs='*', help='Positional arguments for default mode')
 
     args = parser.parse_args()
 
-    if args.json:
-        # JSON mode with flags
-        if not args.proxy:
-            parser.error("JSON mode requires -p/--proxy")
-        
-        json_path = args.json
-        proxy_path = clean_path_input(args.proxy)
-        dataset = args.dataset if args.dataset else 1
-        in_depth = args.in_depth
-        out_depth = args.out_depth
-        
-        # Validate depths
-        if out_depth < in_depth:
-            parser.error("Output depth must be >= input depth")
-        
-        # Determine filter mode
-        filter_mode = None
-        filter_list = None
-        if args.select:
-            filter_mode = 'select'
-        elif args.filter:
-            filter_mode = 'filter'
-            filter_list = args.filter
-        
-        # Process JSON mode with filtering
-        process_json_mode(json_path, proxy_path, dataset, in_depth, out_depth, 
-                         args.clean_image, filter_mode, filter_list)
+    if args.verify_only and args.verify is None:
+        args.verify = ''
+    reserve_bytes = int(args.reserve * 1e9)
+    priority_folders = [f.strip() for f in args.priority.split(',')] if args.priority else None
+    schedule_policy = args.schedule or ('priority' if priority_folders else None)
+    deliver_destinations = [clean_path_input(d) for d in args.deliver.split(',') if d.strip()] if args.deliver else None
 
-    elif args.footage:
-        # Directory mode with flags
-        if not args.proxy:
-            parser.error("Directory mode requires -p/--proxy")
-        
-        footage_path = clean_path_input(args.footage)
-        proxy_path = clean_path_input(args.proxy)
+    if args.json or args.footage or len(args.args) >= 2:
+        if args.json:
+            # JSON mode with flags
+            if not args.proxy:
+                parser.error("JSON mode requires -p/--proxy")
+            source_path, proxy_arg, json_mode = args.json, args.proxy, True
+        elif args.footage:
+            # Directory mode with flags
+            if not args.proxy:
+                parser.error("Directory mode requires -p/--proxy")
+            source_path, proxy_arg = clean_path_input(args.footage), args.proxy
+            json_mode = False
+        else:
+            # Positional arguments mode (backward compatibility), first arg is a JSON file or footage folder
+            source_path, proxy_arg = clean_path_input(args.args[0]), args.args[1]
+            json_mode = is_json_file(source_path)
+        proxy_path = clean_path_input(proxy_arg)
         in_depth = args.in_depth
         out_depth = args.out_depth
-        
-        # Validate depths
-        if out_depth < in_depth:
-            parser.error("Output depth must be >= input depth")
 
-        # Determine filter mode
-        filter_mode = None
-        filter_list = None
-        if args.select:
-            filter_mode = 'select'
-        elif args.filter:
-            filter_mode = 'filter'
-            filter_list = args.filter
-        
-        # Process directory mode with filtering
-        process_directory_mode(footage_path, proxy_path, in_depth, out_depth, 
-                             args.clean_image, filter_mode, filter_list)
-
-    elif len(args.args) >= 2:
-        # Positional arguments mode (backward compatibility)
-        footage_path = clean_path_input(args.args[0])
-        proxy_path = clean_path_input(args.args[1])
-        in_depth = args.in_depth
-        out_depth = args.out_depth
-        
         # Validate depths
         if out_depth < in_depth:
             parser.error("Output depth must be >= input depth")
-        
+
         # Determine filter mode
         filter_mode = None
         filter_list = None
@@ -810,17 +2828,67 @@ up to the specified subfolder level.''',
             filter_mode = 'filter'
             filter_list = args.filter
 
-        # Check if first arg is JSON file
-        if is_json_file(footage_path):
-            # JSON mode
+        if json_mode:
+            if args.watch:
+                parser.error("--watch is only available in Directory mode")
+            if args.verify_only:
+                parser.error("--verify-only is only available in Directory mode")
+        elif args.watch and not args.verify_only:
+            for flag, used in (('--select', args.select), ('--partition', args.partition != 'none'),
+                               ('--verify', args.verify is not None), ('--space-report', args.space_report)):
+                if used:
+                    parser.error(f"--watch cannot be combined with {flag}")
+
+        # Options shared by every mode
+        options = dict(clean_image=args.clean_image, codec=args.codec, project_name=args.project,
+                       dedup_mode=args.dedup, reserve_bytes=reserve_bytes, schedule_policy=schedule_policy,
+                       priority_folders=priority_folders, render_fps=args.render_fps,
+                       scan_items=not args.import_folders, deliver_destinations=deliver_destinations)
+        # Options of the one-shot JSON and Directory modes
+        batch_options = dict(options, filter_mode=filter_mode, filter_list=filter_list,
+                             verify_path=resolve_verify_path(args.verify, proxy_path),
+                             space_report=args.space_report, partition_mode=args.partition,
+                             partition_limit=args.partition_limit)
+
+        if json_mode:
             dataset = args.dataset if args.dataset else 1
-            process_json_mode(footage_path, proxy_path, dataset, in_depth, out_depth,
-                            args.clean_image, filter_mode, filter_list, args.codec)
+            process_json_mode(source_path, proxy_path, dataset, in_depth, out_depth, **batch_options)
+        elif args.verify_only:
+            verify_proxies(find_folders_at_depth(source_path, in_depth, filter_list), proxy_path,
+                           in_depth, out_depth, resolve_verify_path(args.verify, proxy_path))
+        elif args.watch:
+            process_watch_mode(source_path, proxy_path, in_depth, out_depth, filter_list=filter_list,
+                               settle=args.settle, **options)
         else:
-            # Directory mode
-            process_directory_mode(footage_path, proxy_path, in_depth, out_depth,
-                                 args.clean_image, filter_mode, filter_list, args.codec)
-    
+            process_directory_mode(source_path, proxy_path, in_depth, out_depth, **batch_options)
+
+    elif args.project and schedule_policy:
+        # Reorder and render the queue of an existing project
+        if not args.proxy:
+            parser.error("--schedule with --project requires -p/--proxy to tell the shooting days apart")
+        proxy_path = clean_path_input(args.proxy)
+        ProjectManager = get_resolve().GetProjectManager()
+        Project = ProjectManager.LoadProject(args.project)
+        if not Project:
+            print(f"Error: Project not found: {args.project}")
+            sys.exit(1)
+        job_ids = schedule_render_queue(Project, schedule_policy, proxy_path, priority_folders, args.render_fps)
+        delivery_tracker = None
+        if deliver_destinations:
+            delivery_tracker = DeliveryTracker(proxy_path, deliver_destinations)
+            delivery_tracker.add_jobs(Project, job_ids)
+            print(f"Delivering to: {', '.join(deliver_destinations)}")
+        render_jobs_in_order(Project, job_ids,
+                             on_poll=(lambda: delivery_tracker.poll(Project)) if delivery_tracker else None)
+        if delivery_tracker:
+            delivery_tracker.finish(Project)
+
+    elif args.proxy and deliver_destinations:
+        # Deliver (or resume delivering) an existing proxy folder
+        proxy_path = clean_path_input(args.proxy)
+        print(f"Delivering {proxy_path} to: {', '.join(deliver_destinations)}")
+        deliver_files(list_deliverable_files(proxy_path, recursive=True), proxy_path, deliver_destinations)
+
     else:
         parser.print_help()
         sys.exit(1)
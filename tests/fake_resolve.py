@@ -0,0 +1,245 @@
+"""In-memory stand-in for the parts of the DaVinci Resolve scripting API used by Proxy_generator.py"""
+
+import itertools
+import os
+
+STILL_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.tif', '.tiff', '.dng'}
+AUDIO_EXTENSIONS = {'.wav'}
+
+_job_ids = itertools.count(1)
+
+
+class FakeClip:
+    def __init__(self, path, **properties):
+        ext = os.path.splitext(path)[1].lower()
+        self.path = path
+        self.properties = {
+            "File Path": path,
+            "Clip Name": os.path.basename(path),
+            "Type": "Still" if ext in STILL_EXTENSIONS else "Video",
+            "Resolution": "3840x2160",
+            "Audio Ch": "2",
+            "Frames": "250",
+            "FPS": "25",
+        }
+        # P2 cards keep the audio of each clip in separate MXF files under CONTENTS/AUDIO
+        if ext in AUDIO_EXTENSIONS or os.path.basename(os.path.dirname(path)) == "AUDIO":
+            self.properties.update({"Type": "Audio", "Resolution": ""})
+        self.properties.update(properties)
+
+    def GetClipProperty(self, key=None):
+        return dict(self.properties) if key is None else self.properties.get(key, "")
+
+
+class FakeFolder:
+    def __init__(self, name):
+        self.name = name
+        self.subfolders = []
+        self.clips = []
+
+    def GetName(self):
+        return self.name
+
+    def GetSubFolderList(self):
+        return list(self.subfolders)
+
+    def GetClipList(self):
+        return list(self.clips)
+
+
+class FakeTimeline:
+    def __init__(self, name, clips):
+        self.name = name
+        self.clips = list(clips)
+        self.settings = {}
+
+    def GetName(self):
+        return self.name
+
+    def SetSetting(self, key, value):
+        self.settings[key] = value
+        return True
+
+
+class FakeMediaPool:
+    def __init__(self, project):
+        self.project = project
+        self.root = FakeFolder("Master")
+        self.current = self.root
+        self.clips = []
+
+    def GetRootFolder(self):
+        return self.root
+
+    def AddSubFolder(self, parent, name):
+        folder = FakeFolder(name)
+        parent.subfolders.append(folder)
+        return folder
+
+    def MoveClips(self, clips, folder):
+        folder.clips.extend(clips)
+        return True
+
+    def DeleteClips(self, clips):
+        self.clips = [clip for clip in self.clips if clip not in clips]
+        return True
+
+    def SetCurrentFolder(self, folder):
+        self.current = folder
+        return True
+
+    def CreateTimelineFromClips(self, name, clips):
+        if any(timeline.name == name for timeline in self.project.timelines):
+            return None
+        timeline = FakeTimeline(name, clips)
+        self.project.timelines.append(timeline)
+        return timeline
+
+    def ImportMedia(self, items):
+        clips = []
+        for item in items:
+            if isinstance(item, dict):
+                frames = item["EndIndex"] - item["StartIndex"] + 1
+                clip = FakeClip(item["FilePath"], Type="Video", Frames=str(frames), **{"Audio Ch": "0"})
+            else:
+                clip = FakeClip(item)
+            clips.append(clip)
+        self.clips.extend(clips)
+        return clips
+
+
+class FakeProject:
+    def __init__(self, name, resolve_app):
+        self.name = name
+        self.resolve_app = resolve_app
+        self.timelines = []
+        self.jobs = []
+        self.render_settings = {}
+        self.render_preset = None
+        self.started = []
+        self.media_pool = FakeMediaPool(self)
+
+    def GetName(self):
+        return self.name
+
+    def GetMediaPool(self):
+        return self.media_pool
+
+    def GetTimelineCount(self):
+        return len(self.timelines)
+
+    def LoadBurnInPreset(self, name):
+        return True
+
+    def LoadRenderPreset(self, name):
+        self.render_preset = name
+        return True
+
+    def SetRenderSettings(self, settings):
+        self.render_settings.update(settings)
+        return True
+
+    def AddRenderJob(self):
+        timeline = self.timelines[-1]
+        job_id = f"job{next(_job_ids)}"
+        self.jobs.append({
+            "JobId": job_id,
+            "TimelineName": timeline.name,
+            "RenderJobName": job_id,
+            "TargetDir": self.render_settings.get("TargetDir"),
+            "PresetName": self.render_preset,
+            "MarkIn": 0,
+            "MarkOut": sum(int(clip.GetClipProperty("Frames")) for clip in timeline.clips) - 1,
+            "Clips": timeline.clips,
+            "JobStatus": "Ready",
+        })
+        return job_id
+
+    def GetRenderJobList(self):
+        return [{key: value for key, value in job.items() if key not in ("Clips", "JobStatus")}
+                for job in self.jobs]
+
+    def GetRenderJobStatus(self, job_id):
+        for job in self.jobs:
+            if job["JobId"] == job_id:
+                complete = job["JobStatus"] == "Complete"
+                return {"JobStatus": job["JobStatus"], "CompletionPercentage": 100 if complete else 0,
+                        "TimeTakenToRenderInMs": 1000 if complete else 0}
+        return {}
+
+    def StartRendering(self, *job_ids):
+        """Render instantly: jobs become Complete, or Failed if listed in resolve_app.failing_jobs"""
+        job_ids = job_ids or tuple(job["JobId"] for job in self.jobs)
+        self.started.append(job_ids)
+        for job in self.jobs:
+            if job["JobId"] in job_ids and job["JobStatus"] == "Ready":
+                job["JobStatus"] = "Failed" if job["JobId"] in self.resolve_app.failing_jobs else "Complete"
+                if job["JobStatus"] == "Complete" and self.resolve_app.write_proxies:
+                    self.write_proxies(job)
+        return True
+
+    def write_proxies(self, job):
+        os.makedirs(job["TargetDir"], exist_ok=True)
+        for clip in job["Clips"]:
+            stem = os.path.splitext(os.path.basename(clip.path))[0]
+            with open(os.path.join(job["TargetDir"], stem + ".mov"), "wb") as f:
+                f.write(b"proxy of " + clip.path.encode())
+
+    def IsRenderingInProgress(self):
+        return False
+
+
+class FakeProjectManager:
+    def __init__(self, resolve_app):
+        self.resolve_app = resolve_app
+        self.projects = {}
+        self.current = None
+        self.saved = 0
+
+    def CreateProject(self, name):
+        if name in self.projects:
+            return None
+        self.current = self.projects[name] = FakeProject(name, self.resolve_app)
+        return self.current
+
+    def LoadProject(self, name):
+        self.current = self.projects.get(name)
+        return self.current
+
+    def GetCurrentProject(self):
+        return self.current
+
+    def SaveProject(self):
+        self.saved += 1
+        return True
+
+
+class FakeMediaStorage:
+    def __init__(self):
+        self.imported = []
+
+    def AddItemListToMediaPool(self, items):
+        self.imported.append(list(items))
+        clips = []
+        for item in items:
+            if os.path.isdir(item):
+                for root, dirs, files in os.walk(item):
+                    dirs.sort()
+                    clips.extend(FakeClip(os.path.join(root, name)) for name in sorted(files))
+            else:
+                clips.append(FakeClip(item))
+        return clips
+
+
+class FakeResolve:
+    def __init__(self, write_proxies=False):
+        self.failing_jobs = set()
+        self.write_proxies = write_proxies
+        self.project_manager = FakeProjectManager(self)
+        self.media_storage = FakeMediaStorage()
+
+    def GetProjectManager(self):
+        return self.project_manager
+
+    def GetMediaStorage(self):
+        return self.media_storage
@@ -0,0 +1,147 @@
+import os
+
+import Proxy_generator as pg
+from fake_resolve import FakeResolve
+
+
+def write_clip(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def setup_offloads(tmp_path):
+    """Two offloads of the same card at different paths"""
+    day = str(tmp_path / "Footage" / "Shooting_Day_1")
+    data = os.urandom(pg.FINGERPRINT_SAMPLE_SIZE + 1000)
+    write_clip(os.path.join(day, "A001", "C0001.MP4"), data)
+    write_clip(os.path.join(day, "A001_copy", "C0001.MP4"), data)
+    return day
+
+
+def queue(fake, day, card, proxy, store, **kwargs):
+    project = fake.GetProjectManager().LoadProject("test") or fake.GetProjectManager().CreateProject("test")
+    organized = {day: {card: [os.path.join(day, card)]}}
+    job_ids = pg.queue_files_in_project(project, organized, [day], proxy, fingerprint_store=store,
+                                        resolve_app=fake, **kwargs)
+    return project, job_ids
+
+
+def test_copy_of_rendered_clip_is_skipped(tmp_path):
+    day = setup_offloads(tmp_path)
+    proxy = str(tmp_path / "Proxy")
+    fake = FakeResolve()
+    store = pg.open_fingerprint_store(proxy, "skip")
+
+    project, job_ids = queue(fake, day, "A001", proxy, store)
+    project.StartRendering(*job_ids)
+    assert store.update_from_jobs(project)
+    store.save()
+
+    store = pg.open_fingerprint_store(proxy, "skip")
+    _, copy_job_ids = queue(fake, day, "A001_copy", proxy, store)
+    assert copy_job_ids == []
+
+
+def test_copy_of_failed_render_is_queued_again(tmp_path):
+    day = setup_offloads(tmp_path)
+    proxy = str(tmp_path / "Proxy")
+    fake = FakeResolve()
+    store = pg.open_fingerprint_store(proxy, "skip")
+
+    project, job_ids = queue(fake, day, "A001", proxy, store)
+    fake.failing_jobs.update(job_ids)
+    project.StartRendering(*job_ids)
+    store.update_from_jobs(project)
+    store.save()
+
+    store = pg.open_fingerprint_store(proxy, "skip")
+    _, copy_job_ids = queue(fake, day, "A001_copy", proxy, store)
+    assert len(copy_job_ids) == 1
+
+
+def test_unconfirmed_record_counts_once_proxy_exists(tmp_path):
+    day = setup_offloads(tmp_path)
+    proxy = str(tmp_path / "Proxy")
+    fake = FakeResolve()
+    store = pg.open_fingerprint_store(proxy, "skip")
+    queue(fake, day, "A001", proxy, store)
+    store.save()
+
+    # A later run that never saw the render finish
+    store = pg.open_fingerprint_store(proxy, "skip")
+    _, copy_job_ids = queue(fake, day, "A001_copy", proxy, store)
+    assert len(copy_job_ids) == 1
+
+    store = pg.open_fingerprint_store(proxy, "skip")
+    write_clip(os.path.join(proxy, "Shooting_Day_1", "A001", "C0001.mov"), b"proxy")
+    assert store.find_duplicate(next(iter(store.records)), os.path.join(day, "A001_copy", "C0001.MP4"))
+
+
+def test_held_back_clips_are_not_recorded(tmp_path):
+    day = setup_offloads(tmp_path)
+    proxy = str(tmp_path / "Proxy")
+    fake = FakeResolve()
+    store = pg.open_fingerprint_store(proxy, "skip")
+
+    _, job_ids = queue(fake, day, "A001", proxy, store, storage_budget=pg.StorageBudget(reserve_bytes=10 ** 18))
+
+    assert job_ids == []
+    assert store.records == {}
+
+
+def test_identical_frames_keep_their_folder(tmp_path):
+    day = str(tmp_path / "Footage" / "Shooting_Day_1")
+    black_frame = os.urandom(pg.FINGERPRINT_SAMPLE_SIZE + 10)
+    card = os.path.join(day, "A001")
+    for frame in range(1, 5):
+        write_clip(os.path.join(card, f"A001_{frame:07d}.dpx"), black_frame)
+    store = pg.FingerprintStore(str(tmp_path / "store.json"))
+
+    kept, fingerprints = pg.deduplicate_items([card], store, str(tmp_path / "Proxy"))
+
+    assert kept == [card]
+    assert fingerprints == {}
+
+
+def test_duplicate_queued_in_the_same_run_is_linked_once_rendered(tmp_path):
+    footage = tmp_path / "Footage"
+    data = os.urandom(pg.FINGERPRINT_SAMPLE_SIZE + 1000)
+    day1, day2 = str(footage / "Day1"), str(footage / "Day2")
+    write_clip(os.path.join(day1, "A001", "C0001.MP4"), data)
+    write_clip(os.path.join(day2, "A001_backup", "C0001.MP4"), data)
+    proxy = str(tmp_path / "Proxy")
+    fake = FakeResolve(write_proxies=True)
+    project = fake.GetProjectManager().CreateProject("test")
+    store = pg.open_fingerprint_store(proxy, "link")
+    organized = {day1: {"A001": [os.path.join(day1, "A001")]},
+                 day2: {"A001_backup": [os.path.join(day2, "A001_backup")]}}
+
+    job_ids = pg.queue_files_in_project(project, organized, [day1, day2], proxy, fingerprint_store=store,
+                                        dedup_mode="link", resolve_app=fake)
+    assert len(job_ids) == 1
+    link = os.path.join(proxy, "Day2", "A001_backup", "C0001.mov")
+    assert not os.path.lexists(link)
+    store.save()
+
+    project.StartRendering(*job_ids)
+    assert store.update_from_jobs(project)
+    assert os.path.realpath(link) == os.path.join(proxy, "Day1", "A001", "C0001.mov")
+    assert all("links" not in record for record in store.records.values())
+
+
+def test_pending_links_are_created_by_a_later_run(tmp_path):
+    day = setup_offloads(tmp_path)
+    proxy = str(tmp_path / "Proxy")
+    fake = FakeResolve()
+    store = pg.open_fingerprint_store(proxy, "link")
+    queue(fake, day, "A001", proxy, store)
+    queue(fake, day, "A001_copy", proxy, store, dedup_mode="link")
+    store.save()
+
+    # The render finishes after this run has exited
+    write_clip(os.path.join(proxy, "Shooting_Day_1", "A001", "C0001.mov"), b"proxy")
+    pg.open_fingerprint_store(proxy, "link")
+
+    assert os.path.islink(os.path.join(proxy, "Shooting_Day_1", "A001_copy", "C0001.mov"))
@@ -0,0 +1,139 @@
+import builtins
+import json
+import os
+import threading
+
+import pytest
+
+import Proxy_generator as pg
+from fake_resolve import FakeClip, FakeResolve
+
+
+def write_file(path, data=b"proxy"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return str(path)
+
+
+def test_interrupted_delivery_keeps_progress_and_resumes(tmp_path, monkeypatch):
+    proxy = tmp_path / "Proxy"
+    dest = tmp_path / "Dest"
+    files = [write_file(proxy / "Day1" / f"A00{i}.mov", b"x" * 100) for i in range(1, 4)]
+    # Left behind by an earlier run that was killed mid-copy
+    write_file(dest / "Day1" / "A001.mov.partial")
+
+    real_copy = pg.fan_out_copy
+    copied = []
+
+    def interrupting_copy(source_path, dest_paths, *args, **kwargs):
+        if len(copied) == 1:
+            raise KeyboardInterrupt
+        copied.append(source_path)
+        return real_copy(source_path, dest_paths, *args, **kwargs)
+
+    monkeypatch.setattr(pg, "fan_out_copy", interrupting_copy)
+    with pytest.raises(KeyboardInterrupt):
+        pg.deliver_files(files, str(proxy), [str(dest)], workers=1)
+
+    with open(dest / pg.DELIVERY_MANIFEST_NAME, encoding="utf-8") as f:
+        assert list(json.load(f)) == [os.path.join("Day1", "A001.mov")]
+    assert sorted(os.listdir(dest / "Day1")) == ["A001.mov"]
+
+    monkeypatch.setattr(pg, "fan_out_copy", real_copy)
+    totals = pg.deliver_files(files, str(proxy), [str(dest)], workers=1)
+    assert (totals["copied"], totals["skipped"], totals["failed"]) == (2, 1, 0)
+    assert sorted(os.listdir(dest / "Day1")) == ["A001.mov", "A002.mov", "A003.mov"]
+
+
+def test_tracker_delivers_completed_folders_while_the_queue_renders(tmp_path, monkeypatch):
+    fake = FakeResolve(write_proxies=True)
+    project = fake.GetProjectManager().CreateProject("test")
+    pool = project.GetMediaPool()
+    proxy = tmp_path / "Proxy"
+    dest = tmp_path / "Dest"
+    job_ids = []
+    for day in ("Day1", "Day2", "Day3"):
+        pool.CreateTimelineFromClips(day, [FakeClip(f"/footage/{day}/A001.mxf")])
+        project.SetRenderSettings({"TargetDir": str(proxy / day)})
+        job_ids.append(project.AddRenderJob())
+    fake.failing_jobs.add(job_ids[1])
+
+    # Hold the first delivery until the whole queue has been started
+    queue_started = threading.Event()
+    real_deliver = pg.deliver_files
+    started_when_delivering = []
+
+    def gated_deliver(*args, **kwargs):
+        queue_started.wait(5)
+        started_when_delivering.append(len(project.started))
+        return real_deliver(*args, **kwargs)
+
+    monkeypatch.setattr(pg, "deliver_files", gated_deliver)
+    tracker = pg.DeliveryTracker(str(proxy), [str(dest)])
+    tracker.add_jobs(project, job_ids)
+
+    pg.render_jobs_in_order(project, job_ids, poll_interval=0, on_poll=lambda: tracker.poll(project))
+    assert len(project.started) == 3
+    queue_started.set()
+    tracker.finish(project, poll_interval=0)
+
+    assert started_when_delivering == [3, 3]
+    assert os.listdir(dest / "Day1") == ["A001.mov"]
+    assert not (dest / "Day2").exists()
+    assert tracker.failed_dirs == [str(proxy / "Day2")]
+    assert os.listdir(dest / "Day3") == ["A001.mov"]
+
+
+def test_vanished_proxy_counts_as_failed(tmp_path):
+    proxy = tmp_path / "Proxy"
+    dest = tmp_path / "Dest"
+    kept = write_file(proxy / "Day1" / "A001.mov")
+    gone = str(proxy / "Day1" / "A002.mov")
+
+    totals = pg.deliver_files([kept, gone], str(proxy), [str(dest)], workers=1)
+
+    assert (totals["copied"], totals["failed"]) == (1, 1)
+
+
+def test_fan_out_reads_the_source_once_for_every_destination(tmp_path, monkeypatch):
+    proxy = tmp_path / "Proxy"
+    source = write_file(proxy / "Day1" / "A001.mov", os.urandom(3 * 1024 + 17))
+    destinations = [str(tmp_path / f"Dest{i}") for i in range(3)]
+    real_open = open
+    source_opens = []
+
+    def counting_open(path, *args, **kwargs):
+        if str(path) == source:
+            source_opens.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", counting_open)
+    totals = pg.deliver_files([source], str(proxy), destinations, workers=1)
+    monkeypatch.undo()
+
+    assert len(source_opens) == 1
+    assert totals["copied"] == 3
+    with open(source, "rb") as f:
+        data = f.read()
+    for dest in destinations:
+        with open(os.path.join(dest, "Day1", "A001.mov"), "rb") as f:
+            assert f.read() == data
+
+
+def test_checksum_mismatch_leaves_no_file_and_no_manifest_entry(tmp_path, monkeypatch):
+    proxy = tmp_path / "Proxy"
+    source = write_file(proxy / "Day1" / "A001.mov", b"x" * 100)
+    good, bad = str(tmp_path / "Good"), str(tmp_path / "Bad")
+    real_crc32 = pg.file_crc32
+    # Simulate a destination that corrupts what is written to it
+    monkeypatch.setattr(pg, "file_crc32",
+                        lambda path, *args: real_crc32(path, *args) ^ (1 if path.startswith(bad) else 0))
+
+    totals = pg.deliver_files([source], str(proxy), [good, bad], workers=1)
+
+    assert (totals["copied"], totals["failed"]) == (1, 1)
+    assert os.listdir(os.path.join(good, "Day1")) == ["A001.mov"]
+    assert os.listdir(os.path.join(bad, "Day1")) == []
+    with open(os.path.join(bad, pg.DELIVERY_MANIFEST_NAME), encoding="utf-8") as f:
+        assert json.load(f) == {}
@@ -0,0 +1,108 @@
+import os
+
+import pytest
+
+import Proxy_generator as pg
+from fake_resolve import FakeResolve
+
+
+def touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"\0")
+    return path
+
+
+def make_footage(tmp_path, days=("Shooting_Day_1", "Shooting_Day_2"), cards=("A001", "B001")):
+    organized = {}
+    for day in days:
+        day_path = str(tmp_path / "Footage" / day)
+        organized[day_path] = {}
+        for card in cards:
+            card_path = os.path.join(day_path, card)
+            touch(os.path.join(card_path, "C0001.MXF"))
+            organized[day_path][card] = [card_path]
+    return organized
+
+
+def test_folder_partitions_are_named_after_the_folder(tmp_path):
+    organized = make_footage(tmp_path)
+
+    partitions = pg.partition_organized_files(organized, list(organized), "folder")
+
+    assert [label for label, _, _ in partitions] == ["Shooting_Day_1", "Shooting_Day_2"]
+
+
+def test_persistent_project_gets_the_same_folder_partition(tmp_path, monkeypatch):
+    organized = make_footage(tmp_path)
+    fake = FakeResolve()
+    monkeypatch.setattr(pg, "resolve", fake)
+    monkeypatch.setattr("builtins.input", lambda: "n")
+    day2 = [folder for folder in organized if folder.endswith("Shooting_Day_2")]
+
+    pg.process_files_in_resolve(organized, day2, str(tmp_path / "Proxy"), 1, project_name="Show",
+                                partition_mode="folder")
+
+    assert list(fake.project_manager.projects) == ["Show_Shooting_Day_2"]
+
+
+def test_duration_partitions_count_sequences(tmp_path, monkeypatch):
+    day = str(tmp_path / "Footage" / "Shooting_Day_1")
+    organized = {day: {}}
+    for card in ("A001", "A002", "A003"):
+        for frame in range(1, 41):
+            touch(os.path.join(day, card, f"{card}_{frame:07d}.dpx"))
+        organized[day][card] = [os.path.join(day, card)]
+    monkeypatch.setattr(pg, "DEFAULT_SEQUENCE_FPS", 1.0)
+
+    partitions = pg.partition_organized_files(organized, [day], "duration", 1)
+
+    assert [label for label, _, _ in partitions] == ["part01", "part02", "part03"]
+
+
+def test_duration_partitions_fail_when_nothing_can_be_measured(tmp_path, monkeypatch, capsys):
+    organized = make_footage(tmp_path)
+    monkeypatch.setattr(pg, "probe_media", lambda path: None)
+
+    with pytest.raises(SystemExit):
+        pg.partition_organized_files(organized, list(organized), "duration", 10)
+    assert "Could not read the duration of any of 4 clip(s)" in capsys.readouterr().out
+
+
+def test_duration_partitions_warn_about_unreadable_clips(tmp_path, monkeypatch, capsys):
+    organized = make_footage(tmp_path)
+    monkeypatch.setattr(pg, "probe_media", lambda path: {"duration": 600.0} if "A001" in path else None)
+
+    partitions = pg.partition_organized_files(organized, list(organized), "duration", 15)
+
+    assert "Could not read the duration of 2 clip(s)" in capsys.readouterr().out
+    assert len(partitions) == 2
+
+
+def test_clip_partitions_scan_each_group_once(tmp_path, monkeypatch):
+    organized = make_footage(tmp_path)
+    fake = FakeResolve()
+    monkeypatch.setattr(pg, "resolve", fake)
+    monkeypatch.setattr("builtins.input", lambda: "n")
+    real_scan = pg.scan_media_items
+    scanned = []
+    monkeypatch.setattr(pg, "scan_media_items", lambda items, *args: scanned.append(items) or real_scan(items, *args))
+
+    pg.process_files_in_resolve(organized, list(organized), str(tmp_path / "Proxy"), 1, project_name="Show",
+                                partition_mode="clips", partition_limit=2)
+
+    assert len(scanned) == 4
+    assert list(fake.project_manager.projects) == ["Show_part01", "Show_part02"]
+
+
+def test_import_folders_partitions_count_the_video_files_handed_to_resolve(tmp_path, monkeypatch):
+    organized = make_footage(tmp_path, days=("Shooting_Day_1",))
+    day = next(iter(organized))
+    # Sidecars and frames are not scanned away without scanning, but only video files count as clips
+    touch(os.path.join(day, "A001", "C0002.MXF"))
+    touch(os.path.join(day, "A001", "C0002M01.XML"))
+    monkeypatch.setattr(pg, "scan_media_items", lambda *args: pytest.fail("folders must not be scanned"))
+
+    partitions = pg.partition_organized_files(organized, [day], "clips", 2, scan_items=False)
+
+    assert [sorted(partition[day]) for _, partition, _ in partitions] == [["A001"], ["B001"]]
@@ -0,0 +1,120 @@
+import os
+
+import Proxy_generator as pg
+from fake_resolve import FakeResolve
+
+
+def touch(path, size=16):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+    return path
+
+
+def test_padded_dpx_frames_collapse_into_runs(tmp_path):
+    folder = tmp_path / "A001"
+    for frame in list(range(1, 11)) + list(range(20, 31)):
+        touch(str(folder / f"A001_{frame:07d}.dpx"))
+
+    clips, sequences = pg.scan_media_items([str(folder)])
+
+    pattern = os.path.join(str(folder), "A001_%07d.dpx")
+    assert clips == []
+    assert sequences == [
+        {"FilePath": pattern, "StartIndex": 1, "EndIndex": 10},
+        {"FilePath": pattern, "StartIndex": 20, "EndIndex": 30},
+    ]
+
+
+def test_unpadded_frames_stay_one_sequence(tmp_path):
+    folder = tmp_path / "A001"
+    for frame in range(998, 1002):
+        touch(str(folder / f"f_{frame}.dpx"))
+
+    clips, sequences = pg.scan_media_items([str(folder)])
+
+    assert sequences == [{"FilePath": os.path.join(str(folder), "f_%d.dpx"), "StartIndex": 998, "EndIndex": 1001}]
+
+
+def test_numbered_stills_are_not_collapsed(tmp_path):
+    folder = tmp_path / "DCIM"
+    stills = [touch(str(folder / name)) for name in
+              ("DSC00001.JPG", "DSC00002.JPG", "DSC00003.JPG", "DJI_0005.JPG", "DJI_0006.JPG")]
+    for frame in range(1, 11):
+        touch(str(folder / f"IMG_{frame:04d}.DNG"))
+
+    clips, sequences = pg.scan_media_items([str(folder)])
+
+    assert sequences == []
+    assert clips == sorted(stills)
+
+
+def test_long_tiff_runs_are_sequences(tmp_path):
+    folder = tmp_path / "A001"
+    for frame in range(1, pg.MIN_LONG_SEQUENCE_FRAMES + 1):
+        touch(str(folder / f"shot.{frame:04d}.tif"))
+
+    clips, sequences = pg.scan_media_items([str(folder)])
+
+    assert sequences == [{"FilePath": os.path.join(str(folder), "shot.%04d.tif"),
+                          "StartIndex": 1, "EndIndex": pg.MIN_LONG_SEQUENCE_FRAMES}]
+
+
+def test_sidecars_and_r3d_spans_are_skipped(tmp_path):
+    folder = tmp_path / "A001"
+    clip = touch(str(folder / "C0001.MP4"))
+    touch(str(folder / "C0001M01.XML"))
+    touch(str(folder / "THMBNL" / "C0001T01.JPG"))
+    first_span = touch(str(folder / "A001_C001.RDC" / "A001_C001_001.R3D"))
+    touch(str(folder / "A001_C001.RDC" / "A001_C001_002.R3D"))
+    touch(str(folder / "A001_C001.RDC" / "A001_C001.RTN"))
+
+    clips, sequences = pg.scan_media_items([str(folder)])
+
+    assert clips == sorted([clip, first_span])
+    assert sequences == []
+
+
+def test_structured_cards_are_passed_unchanged(tmp_path):
+    p2_card = tmp_path / "Day1" / "P2_A001"
+    touch(str(p2_card / "CONTENTS" / "VIDEO" / "0001AB.MXF"))
+    touch(str(p2_card / "CONTENTS" / "AUDIO" / "0001AB00.MXF"))
+    xdcam_card = tmp_path / "Day1" / "EX_B001"
+    touch(str(xdcam_card / "BPAV" / "CLPR" / "401_0001_01" / "401_0001_01.MP4"))
+    loose = touch(str(tmp_path / "Day1" / "C0001.MP4"))
+
+    clips, sequences = pg.scan_media_items([str(tmp_path / "Day1")])
+
+    assert clips == sorted([str(p2_card), str(xdcam_card), loose])
+
+
+def test_audio_only_clips_do_not_abort_the_folder(tmp_path):
+    footage = tmp_path / "Footage" / "Shooting_Day_1"
+    card = footage / "P2_A001"
+    touch(str(card / "CONTENTS" / "VIDEO" / "0001AB.MXF"))
+    touch(str(card / "CONTENTS" / "AUDIO" / "0001AB00.MXF"))
+    touch(str(card / "CONTENTS" / "AUDIO" / "0001AB01.MXF"))
+    fake = FakeResolve()
+    project = fake.GetProjectManager().CreateProject("test")
+    proxy = str(tmp_path / "Proxy")
+
+    job_ids = pg.queue_files_in_project(project, {str(footage): {"P2_A001": [str(card)]}}, [str(footage)],
+                                        proxy, resolve_app=fake)
+
+    assert fake.media_storage.imported == [[str(card)]]
+    assert len(job_ids) == 1
+    assert [os.path.basename(clip.path) for clip in project.jobs[0]["Clips"]] == ["0001AB.MXF"]
+
+
+def test_user_folders_named_like_card_sidecars_are_imported(tmp_path):
+    day = tmp_path / "Shooting_Day_1"
+    backup_clip = touch(str(day / "Backup" / "A002" / "C0002.MP4"))
+    sub_clip = touch(str(day / "Sub" / "C0003.MP4"))
+    touch(str(day / "Sub" / "C0003M01.XML"))
+    camera_proxy = str(day / "A001" / "M4ROOT" / "SUB" / "C0001S03.MP4")
+    touch(camera_proxy)
+    card_clip = touch(str(day / "A001" / "M4ROOT" / "CLIP" / "C0001.MP4"))
+
+    clips, sequences = pg.scan_media_items([str(day)])
+
+    assert clips == sorted([backup_clip, sub_clip, card_clip])
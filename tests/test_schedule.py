@@ -0,0 +1,74 @@
+import os
+import threading
+import time
+
+import Proxy_generator as pg
+from fake_resolve import FakeClip, FakeResolve
+
+
+def add_job(project, target_dir, frames):
+    project.media_pool.CreateTimelineFromClips(f"timeline {len(project.timelines)}", [FakeClip("c.mov", Frames=str(frames))])
+    project.SetRenderSettings({"TargetDir": target_dir})
+    return project.AddRenderJob()
+
+
+def test_day_comes_from_proxy_root_even_for_a_single_day(tmp_path):
+    proxy = str(tmp_path / "Proxy")
+    project = FakeResolve().GetProjectManager().CreateProject("test")
+    add_job(project, os.path.join(proxy, "Shooting_Day_7", "A001"), 100)
+    add_job(project, os.path.join(proxy, "Shooting_Day_7", "B001"), 50)
+
+    jobs, measured_fps = pg.get_schedulable_jobs(project, proxy)
+
+    assert [job["day"] for job in jobs] == ["Shooting_Day_7", "Shooting_Day_7"]
+    assert measured_fps is None
+
+
+def test_policies_order_jobs(tmp_path):
+    proxy = str(tmp_path / "Proxy")
+    project = FakeResolve().GetProjectManager().CreateProject("test")
+    day9 = add_job(project, os.path.join(proxy, "Shooting_Day_9", "A001"), 300)
+    day10 = add_job(project, os.path.join(proxy, "Shooting_Day_10", "A001"), 200)
+    day2 = add_job(project, os.path.join(proxy, "Shooting_Day_2", "A001"), 100)
+    jobs, _ = pg.get_schedulable_jobs(project, proxy)
+
+    def order(policy, priority=None):
+        return [job["job_id"] for job in pg.order_render_jobs(jobs, policy, priority)]
+
+    assert order("queue") == [day9, day10, day2]
+    assert order("newest-day") == [day10, day9, day2]
+    assert order("shortest-job") == [day2, day10, day9]
+    assert order("priority", ["Shooting_Day_2"]) == [day2, day9, day10]
+    assert pg.time_to_first_complete_day(pg.order_render_jobs(jobs, "shortest-job"), 100) == ("Shooting_Day_2", 1.0)
+
+
+def test_watch_mode_prints_schedule_report(tmp_path, capsys):
+    footage = str(tmp_path / "Footage")
+    proxy = str(tmp_path / "Proxy")
+    day = os.path.join(footage, "Shooting_Day_1")
+    os.makedirs(os.path.join(day, "A001"))
+    with open(os.path.join(day, "A001", "C0001.MP4"), "wb") as f:
+        f.write(b"clip")
+    in_depth = len([p for p in day.split(os.sep) if p])
+    fake = FakeResolve()
+    stop = threading.Event()
+
+    watch = threading.Thread(target=pg.process_watch_mode, kwargs=dict(
+        footage_path=footage, proxy_path=proxy, in_depth=in_depth, out_depth=in_depth + 1,
+        project_name="Show_Proxies", settle=0.05, schedule_policy="newest-day", resolve_app=fake,
+        stop_event=stop, poll_interval=0.05, idle_interval=0.1))
+    watch.start()
+    try:
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            project = fake.project_manager.projects.get("Show_Proxies")
+            if project and project.started:
+                break
+            time.sleep(0.02)
+    finally:
+        stop.set()
+        watch.join(timeout=10)
+
+    output = capsys.readouterr().out
+    assert "=== Render Schedule (1 jobs" in output
+    assert "newest-day    first complete day: Shooting_Day_1" in output
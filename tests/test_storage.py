@@ -0,0 +1,144 @@
+import collections
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import Proxy_generator as pg
+from fake_resolve import FakeClip, FakeResolve
+
+DiskUsage = collections.namedtuple("DiskUsage", "total used free")
+
+
+class FakeDisk:
+    def __init__(self, monkeypatch, free):
+        self.free = free
+        monkeypatch.setattr(pg.shutil, "disk_usage", lambda path: DiskUsage(10 ** 15, 0, self.free))
+
+
+def test_budget_rereads_free_space_and_releases_finished_jobs(tmp_path, monkeypatch):
+    disk = FakeDisk(monkeypatch, free=100)
+    fake = FakeResolve()
+    project = fake.GetProjectManager().CreateProject("test")
+    budget = pg.StorageBudget(reserve_bytes=10)
+    target = str(tmp_path / "Proxy" / "Day1")
+
+    first = budget.admit(target, 60, "A001")
+    assert first is not None
+    assert budget.admit(target, 60, "A002", ["/footage/A002"]) is None
+    assert budget.held_back == [("A002", target, 60, ["/footage/A002"])]
+
+    # Space freed elsewhere (e.g. delivered proxies deleted) is seen by the next admission
+    disk.free = 200
+    assert budget.admit(target, 60, "A003") is not None
+
+    # Once a job has rendered, its output is part of the free space reading instead
+    disk.free = 100
+    project.media_pool.CreateTimelineFromClips("t", [])
+    first["job_ids"].append(project.AddRenderJob())
+    assert budget.admit(target, 30, "A004") is None
+    project.StartRendering(*first["job_ids"])
+    budget.release_finished(project)
+    assert budget.admit(target, 30, "A004") is not None
+
+
+def test_watch_mode_retries_held_back_folders(tmp_path, monkeypatch):
+    disk = FakeDisk(monkeypatch, free=0)
+    footage = str(tmp_path / "Footage")
+    proxy = str(tmp_path / "Proxy")
+    day = os.path.join(footage, "Shooting_Day_1")
+    card = os.path.join(day, "A001")
+    os.makedirs(card)
+    with open(os.path.join(card, "C0001.MP4"), "wb") as f:
+        f.write(b"clip")
+    in_depth = len([p for p in day.split(os.sep) if p])
+    fake = FakeResolve()
+    stop = threading.Event()
+
+    watch = threading.Thread(target=pg.process_watch_mode, kwargs=dict(
+        footage_path=footage, proxy_path=proxy, in_depth=in_depth, out_depth=in_depth + 1,
+        project_name="Show_Proxies", settle=0.05, reserve_bytes=0, resolve_app=fake, stop_event=stop,
+        poll_interval=0.05, idle_interval=0.1, retry_interval=0.2))
+    watch.start()
+    try:
+        deadline = time.monotonic() + 10
+        state_path = os.path.join(proxy, ".proxy_watch_state.json")
+        while time.monotonic() < deadline and not os.path.exists(state_path):
+            time.sleep(0.02)
+        with open(state_path, encoding="utf-8") as f:
+            assert json.load(f)["queued_folders"] == []
+
+        disk.free = 10 ** 12
+        project = fake.project_manager.projects["Show_Proxies"]
+        while time.monotonic() < deadline and not project.jobs:
+            time.sleep(0.02)
+    finally:
+        stop.set()
+        watch.join(timeout=10)
+
+    assert len(fake.media_storage.imported) == 2
+    assert len(project.jobs) == 1
+    with open(os.path.join(proxy, ".proxy_watch_state.json"), encoding="utf-8") as f:
+        assert json.load(f)["queued_folders"] == [card]
+
+
+H265, PRORES = pg.select_render_presets('auto')
+
+
+def test_h265_proxies_use_the_preset_bitrate_at_any_width():
+    # (5 Mbps video + 128 kbps AAC) for a minute, plus 2% container overhead
+    assert pg.estimate_proxy_bytes(60, 25, 2, H265, 1920) == pytest.approx(39229200, abs=1)
+    assert pg.estimate_proxy_bytes(60, 25, 2, H265, 1440) == pytest.approx(39229200, abs=1)
+    assert pg.estimate_proxy_bytes(60, 25, 0, H265, 1920) == pytest.approx(38250000, abs=1)
+
+
+@pytest.mark.parametrize("fps, bitrate", [
+    (23.976, 36000000), (25, 38000000), (29.97, 45000000), (59.94, 91000000),
+    (48, 76000000 * 48 / 50),  # not in the table: nearest rate, scaled by fps
+])
+def test_prores_proxy_rate_is_looked_up_by_fps(fps, bitrate):
+    assert pg.estimate_proxy_bytes(60, fps, 0, PRORES, 1920) == pytest.approx(bitrate / 8 * 60 * 1.02, abs=1)
+
+
+def test_prores_proxy_scales_with_width_and_adds_pcm_per_channel():
+    full_width = pg.estimate_proxy_bytes(60, 25, 0, PRORES, 1920)
+    assert pg.estimate_proxy_bytes(60, 25, 0, PRORES, "960") == pytest.approx(full_width / 2, abs=1)
+    # 4 channels of 48 kHz 32-bit PCM
+    assert pg.estimate_proxy_bytes(60, 25, 4, PRORES, 1920) == pytest.approx(
+        (38000000 + 4 * 48000 * 32) / 8 * 60 * 1.02, abs=1)
+
+
+def test_job_estimate_sums_clips_and_ignores_unknown_properties():
+    clips = [
+        FakeClip("/footage/A001/C0001.MP4", Frames="250", FPS="25", **{"Audio Ch": "2"}),
+        FakeClip("/footage/A001/C0002.MP4", Frames="500", FPS="25", **{"Audio Ch": ""}),
+        FakeClip("/footage/A001/C0003.MP4", Frames="", FPS="25"),
+    ]
+
+    assert pg.estimate_job_bytes(clips, PRORES, 1920) == (
+        pg.estimate_proxy_bytes(10, 25, 2, PRORES, 1920) + pg.estimate_proxy_bytes(20, 25, 0, PRORES, 1920))
+
+
+def test_folder_is_held_back_when_its_estimate_does_not_fit(tmp_path, monkeypatch):
+    day = str(tmp_path / "Footage" / "Shooting_Day_1")
+    card = os.path.join(day, "A001")
+    os.makedirs(card)
+    with open(os.path.join(card, "C0001.MP4"), "wb") as f:
+        f.write(b"clip")
+    # The fake clip is 10 s of 25 fps UHD with stereo audio, rendered with the H.265 preset
+    estimate = pg.estimate_proxy_bytes(10, 25, 2, H265, 1920)
+    disk = FakeDisk(monkeypatch, free=estimate - 1)
+    fake = FakeResolve()
+    project = fake.GetProjectManager().CreateProject("test")
+    organized = {day: {"A001": [card]}}
+
+    budget = pg.StorageBudget(reserve_bytes=0)
+    assert pg.queue_files_in_project(project, organized, [day], str(tmp_path / "Proxy"),
+                                     storage_budget=budget, resolve_app=fake) == []
+    assert [held[2] for held in budget.held_back] == [estimate]
+
+    disk.free = estimate
+    assert len(pg.queue_files_in_project(project, organized, [day], str(tmp_path / "Proxy"),
+                                         storage_budget=pg.StorageBudget(reserve_bytes=0), resolve_app=fake)) == 1
@@ -0,0 +1,130 @@
+import json
+import os
+import struct
+
+import Proxy_generator as pg
+
+
+def atom(kind, *children):
+    payload = b"".join(children)
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def media_header(kind, timescale, duration):
+    # version/flags, creation and modification time, then timescale and duration
+    return atom(kind, bytes(12), struct.pack(">II", timescale, duration), bytes(80))
+
+
+def handler(handler_type):
+    return atom(b"hdlr", bytes(8), handler_type, bytes(12))
+
+
+def video_track(frames, fps):
+    sample_sizes = atom(b"stsz", bytes(4), struct.pack(">II", 0, frames))
+    return atom(b"trak", atom(b"mdia", media_header(b"mdhd", fps, frames), handler(b"vide"),
+                                atom(b"minf", atom(b"stbl", sample_sizes))))
+
+
+def audio_track(channels, seconds):
+    # 16 byte sample entry header, then a version 0 sound description
+    entry = struct.pack(">I4s6xH", 36, b"lpcm", 1) + struct.pack(">HH4sHHHH", 0, 0, b"", channels, 16, 0, 0) + bytes(4)
+    sample_description = atom(b"stsd", bytes(4), struct.pack(">I", 1), entry)
+    return atom(b"trak", atom(b"mdia", media_header(b"mdhd", 48000, 48000 * seconds), handler(b"soun"),
+                                atom(b"minf", atom(b"stbl", sample_description))))
+
+
+def write_movie(path, frames=250, fps=25, audio_channels=2, complete=True):
+    """Write a QuickTime file with just enough header atoms for probe_quicktime"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tracks = [video_track(frames, fps)]
+    if audio_channels:
+        tracks.append(audio_track(audio_channels, frames // fps))
+    moov = atom(b"moov", media_header(b"mvhd", fps, frames), *tracks)
+    with open(path, "wb") as f:
+        f.write(atom(b"ftyp", b"qt  ", bytes(4)))
+        f.write(atom(b"mdat", bytes(4096)))
+        if complete:
+            f.write(moov)
+    return str(path)
+
+
+def compare_files(source, proxy):
+    return pg.compare_media(pg.probe_media(source), pg.probe_media(proxy))
+
+
+def test_probe_quicktime_reads_frames_duration_and_channels(tmp_path):
+    path = write_movie(str(tmp_path / "C0001.MP4"), frames=250, fps=25, audio_channels=4)
+
+    assert pg.probe_quicktime(path) == {"duration": 10.0, "frames": 250, "audio_channels": 4}
+
+
+def test_compare_media(tmp_path):
+    source = write_movie(str(tmp_path / "C0001.MP4"))
+
+    assert compare_files(source, write_movie(str(tmp_path / "match.mov"))) == []
+    assert compare_files(source, write_movie(str(tmp_path / "truncated.mov"), complete=False)) == ["proxy unreadable"]
+    assert compare_files(source, write_movie(str(tmp_path / "short.mov"), frames=200)) == ["frame count"]
+    assert compare_files(source, write_movie(str(tmp_path / "mono.mov"), audio_channels=1)) == ["audio channels"]
+
+
+def test_pairing_follows_the_card_rules(tmp_path):
+    day = tmp_path / "Footage" / "Day1"
+    in_depth = len([p for p in str(day).split(os.sep) if p])
+    proxy = tmp_path / "Proxy"
+    sony_clip = write_movie(str(day / "A001" / "PRIVATE" / "M4ROOT" / "CLIP" / "C0001.MP4"))
+    write_movie(str(day / "A001" / "PRIVATE" / "M4ROOT" / "SUB" / "C0001S03.MP4"))
+    write_movie(str(day / "B001" / "CONTENTS" / "AUDIO" / "0001AB00.MXF"))
+    p2_clip = write_movie(str(day / "B001" / "CONTENTS" / "VIDEO" / "0001AB.MXF"))
+    r3d_clip = write_movie(str(day / "C001" / "A001_C001.RDC" / "A001_C001_001.R3D"))
+    write_movie(str(day / "C001" / "A001_C001.RDC" / "A001_C001_002.R3D"))
+    sony_proxy = write_movie(str(proxy / "Day1" / "A001" / "C0001.mov"))
+
+    pairs, missing, orphans = pg.pair_proxies_with_sources([str(day)], str(proxy), in_depth, in_depth + 1)
+
+    assert pairs == [(sony_clip, sony_proxy)]
+    assert missing == sorted([p2_clip, r3d_clip])
+    assert orphans == []
+
+
+def test_p2_audio_channels_come_from_the_linked_audio_files(tmp_path, monkeypatch):
+    contents = tmp_path / "B001" / "CONTENTS"
+    video = write_movie(str(contents / "VIDEO" / "0001AB.MXF"), audio_channels=0)
+    for channel in range(4):
+        write_movie(str(contents / "AUDIO" / f"0001AB0{channel}.MXF"), audio_channels=0)
+    write_movie(str(contents / "AUDIO" / "0002CD00.MXF"), audio_channels=0)
+    proxy = write_movie(str(tmp_path / "Proxy" / "0001AB.mov"), audio_channels=4)
+    # MXF has no native reader, probe it like a QuickTime file instead of requiring ffprobe
+    monkeypatch.setattr(pg, "probe_media", pg.probe_quicktime)
+
+    source_path, proxy_path, source_info, proxy_info = pg.probe_pair((video, proxy))
+
+    assert source_info["audio_channels"] == 4
+    assert pg.compare_media(source_info, proxy_info) == []
+
+
+def test_report_round_trips_through_json_mode(tmp_path, monkeypatch):
+    day = tmp_path / "Footage" / "Day1"
+    in_depth = len([p for p in str(day).split(os.sep) if p])
+    proxy = tmp_path / "Proxy"
+    good = write_movie(str(day / "A001" / "C0001.MP4"))
+    write_movie(str(proxy / "Day1" / "A001" / "C0001.mov"))
+    short = write_movie(str(day / "A001" / "C0002.MP4"))
+    write_movie(str(proxy / "Day1" / "A001" / "C0002.mov"), frames=100)
+    missing = write_movie(str(day / "A001" / "C0003.MP4"))
+    report_path = str(proxy / "proxy_verify.json")
+
+    report = pg.verify_proxies([str(day)], str(proxy), in_depth, in_depth + 1, report_path, workers=1)
+
+    with open(report_path, encoding="utf-8") as f:
+        assert json.load(f) == report
+    assert report["files_only_in_group1"] == [missing]
+    assert [m["path1"] for m in report["frame_count_mismatches"]] == [short]
+
+    queued = []
+    monkeypatch.setattr(pg, "process_files_in_resolve",
+                        lambda organized_files, *args, **kwargs: queued.append(organized_files))
+    pg.process_json_mode(report_path, str(proxy), 1, in_depth, in_depth + 1)
+
+    queued_files = [path for subfolders in queued[0].values() for files in subfolders.values() for path in files]
+    assert sorted(queued_files) == sorted([missing, short])
+    assert good not in queued_files
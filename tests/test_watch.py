@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import Proxy_generator as pg
+from fake_resolve import FakeResolve
+
+
+def depth_of(path):
+    return len([p for p in path.split(os.sep) if p])
+
+
+def make_card(footage, day, card, clips=("C0001.MP4",)):
+    card_path = os.path.join(footage, day, card)
+    os.makedirs(card_path, exist_ok=True)
+    for name in clips:
+        with open(os.path.join(card_path, name), "wb") as f:
+            f.write(os.urandom(2048))
+    return card_path
+
+
+def poll_until(watcher, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        ready = watcher.poll(timeout=0.05)
+        if ready:
+            return ready
+    return []
+
+
+def test_watcher_reports_stable_folder_once(tmp_path):
+    footage = str(tmp_path / "Footage")
+    card = make_card(footage, "Shooting_Day_1", "A001")
+    watcher = pg.FolderWatcher(footage, depth_of(card), settle=0, poll_interval=0.01, idle_interval=0.05)
+
+    assert poll_until(watcher) == [card]
+    assert poll_until(watcher, timeout=0.3) == []
+
+
+def test_watcher_waits_for_folder_to_settle(tmp_path):
+    footage = str(tmp_path / "Footage")
+    card = make_card(footage, "Shooting_Day_1", "A001")
+    watcher = pg.FolderWatcher(footage, depth_of(card), settle=60, poll_interval=0.01, idle_interval=0.05)
+
+    assert poll_until(watcher, timeout=0.3) == []
+    assert card in watcher.pending
+
+
+def test_watcher_skips_known_and_filtered_folders(tmp_path):
+    footage = str(tmp_path / "Footage")
+    known = make_card(footage, "Shooting_Day_1", "A001")
+    filtered = make_card(footage, "Shooting_Day_2", "A001")
+    wanted = make_card(footage, "Shooting_Day_1", "A002")
+    watcher = pg.FolderWatcher(footage, depth_of(known), settle=0, poll_interval=0.01, idle_interval=0.05,
+                               filter_names=["Shooting_Day_1"], in_depth=depth_of(known) - 1, known=[known])
+
+    assert poll_until(watcher) == [wanted]
+    assert filtered not in watcher.pending
+
+
+def test_idle_poll_with_inotify_does_not_block(tmp_path):
+    waiter = pg.create_waiter()
+    if waiter is None:
+        pytest.skip("inotify not available")
+    footage = str(tmp_path / "Footage")
+    os.makedirs(os.path.join(footage, "Shooting_Day_1"))
+    watcher = pg.FolderWatcher(footage, depth_of(footage) + 2, idle_interval=0.2, waiter=waiter)
+    try:
+        start = time.monotonic()
+        assert watcher.poll() == []
+        assert time.monotonic() - start < 2
+    finally:
+        waiter.close()
+
+
+def test_inotify_rewatches_recreated_directory(tmp_path):
+    waiter = pg.create_waiter()
+    if waiter is None:
+        pytest.skip("inotify not available")
+    footage = str(tmp_path / "Footage")
+    day = os.path.join(footage, "Shooting_Day_1")
+    os.makedirs(day)
+    watcher = pg.FolderWatcher(footage, depth_of(day) + 1, idle_interval=0.05, waiter=waiter)
+    try:
+        watcher.scan()
+        assert day in waiter.watched
+
+        os.rmdir(day)
+        watcher.scan()
+        assert day not in waiter.watched
+
+        # Deleted and re-created between two scans (the inode number may even be reused)
+        os.makedirs(day)
+        watcher.scan()
+        os.rmdir(day)
+        os.makedirs(day)
+        waiter.wait(0.1)
+        assert day not in waiter.watched
+        watcher.scan()
+        assert day in waiter.watched
+
+        # The new directory is watched: creating a card in it wakes the waiter
+        os.makedirs(os.path.join(day, "A001"))
+        assert waiter.wait(1)
+    finally:
+        waiter.close()
+
+
+def test_watch_mode_queues_new_cards_with_fake_backend(tmp_path):
+    footage = str(tmp_path / "Footage")
+    proxy = str(tmp_path / "Proxy")
+    day = os.path.join(footage, "Shooting_Day_1")
+    os.makedirs(day)
+    fake = FakeResolve()
+    stop = threading.Event()
+    in_depth = depth_of(day)
+
+    watch = threading.Thread(target=pg.process_watch_mode, kwargs=dict(
+        footage_path=footage, proxy_path=proxy, in_depth=in_depth, out_depth=in_depth + 1,
+        project_name="Show_Proxies", settle=0.1, resolve_app=fake, stop_event=stop,
+        poll_interval=0.05, idle_interval=0.1))
+    watch.start()
+    try:
+        card = make_card(footage, "Shooting_Day_1", "A001", clips=("C0001.MP4", "C0002.MP4"))
+        deadline = time.monotonic() + 10
+        project = None
+        while time.monotonic() < deadline:
+            project = fake.project_manager.projects.get("Show_Proxies")
+            if project and project.started:
+                break
+            time.sleep(0.05)
+    finally:
+        stop.set()
+        watch.join(timeout=10)
+
+    assert not watch.is_alive()
+    assert [job["TargetDir"] for job in project.jobs] == [os.path.join(proxy, "Shooting_Day_1", "A001")]
+    assert project.started == [(project.jobs[0]["JobId"],)]
+    with open(os.path.join(proxy, ".proxy_watch_state.json"), encoding="utf-8") as f:
+        assert json.load(f)["queued_folders"] == [card]